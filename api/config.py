@@ -33,6 +33,12 @@ QURAN_API_BASE = "https://api.alquran.cloud/v1"
 VIDEO_WIDTH = 1080
 VIDEO_HEIGHT = 1920
 VIDEO_FPS = 30
+# "auto" encodes with NVENC when an NVIDIA GPU is present, else libx264
+VIDEO_CODEC = os.getenv("VIDEO_CODEC", "auto")
+VIDEO_PRESET = os.getenv("VIDEO_PRESET", "veryfast")  # libx264 preset
+# "ffmpeg" composites with one ffmpeg filter graph, "moviepy" frame by frame
+VIDEO_RENDERER = os.getenv("VIDEO_RENDERER", "ffmpeg")
+VIDEO_WORKERS = int(os.getenv("VIDEO_WORKERS", 2))  # Concurrent render threads
 
 # Qari options
 QARI_OPTIONS = {
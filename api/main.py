@@ -8,6 +8,7 @@ from api.routers import videos, generate, settings, stats, tiktok, caption
 from api.database import init_db
 from api.scheduler import init_scheduler
 from api.logging_config import setup_logging
+from tiktok.caption_generator import CaptionGenerator
 
 
 @asynccontextmanager
@@ -18,6 +19,7 @@ async def lifespan(app: FastAPI):
     init_scheduler()
     yield
     # Shutdown
+    CaptionGenerator.close()
 
 
 app = FastAPI(
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 from typing import Optional
 from sqlalchemy.orm import Session
@@ -121,9 +122,10 @@ async def generate_caption(video_id: str, db: Session = Depends(get_db)):
         settings = settings_repo.get()
         hashtags = settings.tiktok_hashtags or "#quran #islam #muslim #ayat #alquran #fyp"
         
-        # Generate caption
+        # Generate caption (the AI request is blocking, keep it off the event loop)
         caption_gen = CaptionGenerator()
-        caption = caption_gen.generate_caption(
+        caption = await run_in_threadpool(
+            caption_gen.generate_caption,
             surah_name=video.surah_name,
             ayat_number=video.ayat,
             text_translation=video.text_translation,
@@ -160,9 +162,10 @@ async def post_to_tiktok(video_id: str, db: Session = Depends(get_db)):
         if not video:
             raise HTTPException(status_code=404, detail="Video not found")
         
-        # Generate caption
+        # Generate caption (the AI request is blocking, keep it off the event loop)
         caption_gen = CaptionGenerator()
-        caption = caption_gen.generate_caption(
+        caption = await run_in_threadpool(
+            caption_gen.generate_caption,
             surah_name=video.surah_name,
             ayat_number=video.ayat,
             text_translation=video.text_translation
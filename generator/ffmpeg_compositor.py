@@ -0,0 +1,408 @@
+"""
+FFmpeg filter-graph compositor for Quran Video Generator.
+
+Renders a complete lock screen video (portrait crop, darkening, static
+chrome, timed text overlays and the murotal audio) in a single ffmpeg
+invocation, so frames never leave ffmpeg to be round-tripped through
+NumPy the way MoviePy compositing does.
+"""
+
+import tempfile
+import subprocess
+from dataclasses import dataclass, replace
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+from moviepy.config import get_setting
+from moviepy.video.VideoClip import VideoClip
+from moviepy.video.io.VideoFileClip import VideoFileClip
+from moviepy.video.io.ffmpeg_reader import FFMPEG_VideoReader
+
+
+@dataclass
+class TextOverlay:
+    """Static RGBA image shown horizontally centered with a fade in/out."""
+    image: np.ndarray                # RGBA pixels (H, W, 4)
+    start: float                     # When the overlay appears (seconds)
+    duration: float                  # How long it stays visible (seconds)
+    y: int                           # Top edge in the output frame (pixels)
+    fade: float = 0.0                # Fade in and fade out duration (seconds)
+
+
+def crop_transparent_margins(overlay: TextOverlay) -> TextOverlay:
+    """
+    Trim fully transparent margins off an overlay without moving its pixels.
+
+    Text images carry padding for their shadows, and every padded pixel is
+    blended on every frame the overlay is visible. Rows are trimmed tightly
+    (moving y down); columns by the same amount on both sides, since
+    overlays are horizontally centered.
+    """
+    alpha = overlay.image[:, :, 3]
+    rows = np.flatnonzero(alpha.any(axis=1))
+    if rows.size == 0:
+        return overlay
+    cols = np.flatnonzero(alpha.any(axis=0))
+    width = alpha.shape[1]
+    margin = min(cols[0], width - 1 - cols[-1])
+    if rows[0] == 0 and rows[-1] == alpha.shape[0] - 1 and margin == 0:
+        return overlay
+    image = overlay.image[rows[0]:rows[-1] + 1, margin:width - margin]
+    return replace(overlay, image=np.ascontiguousarray(image), y=overlay.y + int(rows[0]))
+
+
+def merge_concurrent_overlays(overlays: List[TextOverlay], frame_width: int) -> List[TextOverlay]:
+    """
+    Pre-composite adjacent overlays that share the same timing into one sprite.
+
+    Arabic lines and their translations appear and fade together, so each
+    pair can be blended onto the frame as a single image. Overlays far
+    apart are kept separate, since a mostly transparent union sprite would
+    cost more to blend than the members. Sprites are centered horizontally,
+    so the merged width keeps the frame width's parity to leave every
+    member at exactly the same pixel position.
+    """
+    def timing(overlay):
+        return (overlay.start, overlay.duration, overlay.fade)
+
+    def area(group):
+        return sum(o.image.shape[0] * o.image.shape[1] for o in group)
+
+    def union_area(group):
+        width = max(o.image.shape[1] for o in group)
+        height = max(o.y + o.image.shape[0] for o in group) - min(o.y for o in group)
+        return width * height
+
+    groups: List[List[TextOverlay]] = []
+    for overlay in overlays:
+        if groups and timing(groups[-1][0]) == timing(overlay):
+            candidate = groups[-1] + [overlay]
+            if union_area(candidate) <= 1.5 * area(candidate):
+                groups[-1] = candidate
+                continue
+        groups.append([overlay])
+
+    merged = []
+    for group in groups:
+        if len(group) == 1:
+            merged.append(group[0])
+            continue
+        width = max(o.image.shape[1] for o in group)
+        width += (frame_width - width) % 2
+        top = min(o.y for o in group)
+        bottom = max(o.y + o.image.shape[0] for o in group)
+        sprite = Image.new('RGBA', (width, bottom - top), (0, 0, 0, 0))
+        for o in group:
+            sprite.alpha_composite(Image.fromarray(o.image), dest=((width - o.image.shape[1]) // 2, o.y - top))
+        merged.append(TextOverlay(
+            np.asarray(sprite), start=group[0].start, duration=group[0].duration, y=top, fade=group[0].fade
+        ))
+    return merged
+
+
+def chrome_bands(chrome: np.ndarray) -> List[Tuple[int, np.ndarray]]:
+    """
+    Cut a full-frame RGBA layer into the row bands that have visible pixels.
+
+    The lock screen chrome only covers a few dozen rows at the top and
+    bottom of the frame, so overlaying its bands (as (y, image) pairs)
+    spares ffmpeg fading and blending a mostly transparent full frame.
+    """
+    rows = np.flatnonzero(chrome[:, :, 3].any(axis=1))
+    if rows.size == 0:
+        return []
+    runs = np.split(rows, np.flatnonzero(np.diff(rows) > 1) + 1)
+    return [(int(run[0]), chrome[run[0]:run[-1] + 1]) for run in runs]
+
+
+def portrait_crop_filter(width: int, height: int) -> str:
+    """Centered crop to the output aspect ratio"""
+    return (
+        f"crop=w='min(iw,trunc(ih*{width}/{height}))'"
+        f":h='min(ih,trunc(iw*{height}/{width}))'"
+    )
+
+
+class _PortraitVideoReader(FFMPEG_VideoReader):
+    """FFMPEG_VideoReader that crops to the target aspect ratio before scaling"""
+
+    def __init__(self, filename, hwaccel=None, **kwargs):
+        self.hwaccel = hwaccel
+        super().__init__(filename, **kwargs)
+
+    def initialize(self, starttime=0):
+        """Open the file with a crop,scale chain instead of the plain scale filter"""
+        self.close()
+
+        i_arg = ["-hwaccel", self.hwaccel] if self.hwaccel else []
+        if starttime != 0:
+            offset = min(1, starttime)
+            i_arg += ["-ss", "%.06f" % (starttime - offset), "-i", self.filename, "-ss", "%.06f" % offset]
+        else:
+            i_arg += ["-i", self.filename]
+
+        width, height = self.size
+        cmd = [get_setting("FFMPEG_BINARY")] + i_arg + [
+            "-loglevel", "error",
+            "-f", "image2pipe",
+            "-vf", f"{portrait_crop_filter(width, height)},scale={width}:{height}:flags={self.resize_algo}",
+            "-pix_fmt", self.pix_fmt,
+            "-vcodec", "rawvideo", "-"
+        ]
+        self.proc = subprocess.Popen(
+            cmd, bufsize=self.bufsize, stdout=subprocess.PIPE, stderr=subprocess.PIPE, stdin=subprocess.DEVNULL
+        )
+
+
+class PortraitVideoClip(VideoFileClip):
+    """
+    Video file decoded by ffmpeg already cropped and scaled to the output size.
+
+    The crop and resize run inside the decoder's filter chain, so frames
+    reach Python at their final size with no per-frame resampling. The
+    audio track is not opened. Close it like any VideoFileClip.
+
+    Args:
+        filename: Video file path
+        width: Output frame width
+        height: Output frame height
+        hwaccel: Hardware decoder (e.g. "cuda"), if any; decoded frames
+                 are copied back to system memory for the filter chain
+    """
+
+    def __init__(self, filename: str, width: int, height: int, hwaccel: Optional[str] = None):
+        VideoClip.__init__(self)
+        self.reader = _PortraitVideoReader(
+            filename, hwaccel=hwaccel, target_resolution=(height, width), resize_algo="bilinear"
+        )
+        self.duration = self.end = self.reader.duration
+        self.fps = self.reader.fps
+        self.size = self.reader.size
+        self.rotation = self.reader.rotation
+        self.filename = filename
+        self.make_frame = lambda t: self.reader.get_frame(t)
+
+
+def run_ffmpeg(args: List[str]) -> None:
+    """Run the ffmpeg binary bundled with MoviePy, raising on non-zero exit"""
+    cmd = [get_setting("FFMPEG_BINARY"), "-y", "-loglevel", "error"] + args
+    result = subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        stderr = result.stderr.decode("utf-8", errors="ignore").strip()
+        raise Exception(f"ffmpeg failed: {stderr[-500:]}")
+
+
+def audio_filter(audio_duration: float, video_duration: float) -> str:
+    """
+    Audio filter that fades out the last 0.5s (prevents crackling) and pads
+    with silence so the audio track spans the whole video.
+    """
+    fade_start = max(audio_duration - 0.5, 0)
+    return (
+        f"afade=t=out:st={fade_start:.3f}:d=0.5,"
+        f"apad=whole_dur={video_duration:.3f}"
+    )
+
+
+def encode_frames(
+    frames: Iterable[np.ndarray],
+    output_path: Path,
+    width: int,
+    height: int,
+    fps: int,
+    duration: float,
+    audio_path: str,
+    audio_duration: float,
+    codec: str = "libx264",
+    preset: str = "veryfast",
+    codec_params: Optional[List[str]] = None
+) -> None:
+    """
+    Encode RGB frames and mux the murotal audio with one ffmpeg process.
+
+    Frames are piped as rawvideo straight from their buffers, and the
+    audio is encoded from the source file in the same pass, so there is no
+    intermediate video file to write and remux.
+
+    Args:
+        frames: uint8 RGB frames (height, width, 3) at the output frame rate
+        output_path: Destination MP4 path
+        width: Frame width
+        height: Frame height
+        fps: Output frame rate
+        duration: Output video duration in seconds
+        audio_path: Murotal audio file
+        audio_duration: Audio duration in seconds (for the fade out)
+        codec: ffmpeg video encoder
+        preset: Encoder preset
+        codec_params: Extra encoder arguments
+    """
+    cmd = [
+        get_setting("FFMPEG_BINARY"), "-y", "-loglevel", "error",
+        "-f", "rawvideo", "-pix_fmt", "rgb24", "-s", f"{width}x{height}", "-r", str(fps), "-i", "-",
+        "-i", str(audio_path),
+        "-map", "0:v:0", "-map", "1:a:0",
+        "-af", audio_filter(audio_duration, duration),
+        "-c:v", codec, "-preset", preset, "-pix_fmt", "yuv420p",
+    ]
+    cmd += codec_params or []
+    cmd += [
+        # 0 lets libx264 size its own frame/lookahead threads (1.5x cores)
+        "-threads", "0",
+        "-t", f"{duration:.3f}",
+        "-c:a", "aac", "-b:a", "192k",
+        "-movflags", "+faststart",
+        str(output_path)
+    ]
+    proc = subprocess.Popen(cmd, stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    try:
+        for frame in frames:
+            proc.stdin.write(memoryview(np.ascontiguousarray(frame, dtype=np.uint8)))
+        proc.stdin.close()
+    except BrokenPipeError:
+        pass  # ffmpeg exited early, its error is reported below
+    except BaseException:
+        proc.kill()
+        proc.wait()
+        raise
+    stderr = proc.stderr.read()
+    proc.wait()
+    if proc.returncode != 0:
+        stderr = stderr.decode("utf-8", errors="ignore").strip()
+        raise Exception(f"ffmpeg failed: {stderr[-500:]}")
+
+
+def _still_filter(duration: float) -> str:
+    """Repeat a single decoded image frame for the given duration"""
+    return f"format=rgba,loop=loop=-1:size=1,trim=duration={duration:.3f},"
+
+
+def _fade_filters(duration: float, fade: float) -> str:
+    """Alpha fade in/out chain for an overlay stream of the given duration"""
+    if fade <= 0:
+        return ""
+    fade = min(fade, duration)
+    return (
+        f"fade=t=in:st=0:d={fade:.3f}:alpha=1,"
+        f"fade=t=out:st={max(duration - fade, 0):.3f}:d={fade:.3f}:alpha=1,"
+    )
+
+
+def build_filter_graph(
+    width: int,
+    height: int,
+    fps: int,
+    darken: float,
+    duration: float,
+    chrome_fade: float,
+    chrome_rows: List[int],
+    overlays: List[TextOverlay]
+) -> str:
+    """
+    Build the -filter_complex graph for composite_video.
+
+    Input 0 is the background, input 1 the audio, then one single-frame PNG
+    input per chrome band (top edges in chrome_rows) and per text overlay,
+    in order. Each PNG is decoded once and repeated with the loop filter.
+    The result is labelled [vout].
+    """
+    # Center-crop to the target aspect ratio, then scale
+    crop = portrait_crop_filter(width, height)
+    lut = f"trunc(val*{darken:.4f})"
+    chrome_filter = f"fade=t=in:st=0:d={chrome_fade:.3f}:alpha=1" if chrome_fade > 0 else "null"
+    graph = [
+        f"[0:v]{crop},scale={width}:{height}:flags=bilinear,setsar=1,fps={fps},"
+        f"format=rgb24,lutrgb=r='{lut}':g='{lut}':b='{lut}',setpts=PTS-STARTPTS[bg]",
+    ]
+    last = "bg"
+    for i, y in enumerate(chrome_rows):
+        graph.append(f"[{2 + i}:v]{_still_filter(duration)}{chrome_filter}[c{i}]")
+        graph.append(f"[{last}][c{i}]overlay=0:{y}:format=rgb[c{i}out]")
+        last = f"c{i}out"
+    graph.append(f"[{last}]null[v0]")
+    first_text = 2 + len(chrome_rows)
+    for i, overlay in enumerate(overlays):
+        graph.append(
+            f"[{first_text + i}:v]{_still_filter(overlay.duration)}{_fade_filters(overlay.duration, overlay.fade)}"
+            f"setpts=PTS-STARTPTS+{overlay.start:.3f}/TB[t{i}]"
+        )
+        graph.append(
+            f"[v{i}][t{i}]overlay=x=(W-w)/2:y={overlay.y}:eof_action=pass:format=rgb[v{i + 1}]"
+        )
+    graph.append(f"[v{len(overlays)}]format=yuv420p[vout]")
+    return ";".join(graph)
+
+
+def composite_video(
+    background_path: str,
+    audio_path: str,
+    output_path: Path,
+    duration: float,
+    audio_duration: float,
+    width: int,
+    height: int,
+    fps: int,
+    darken: float,
+    chrome: np.ndarray,
+    chrome_fade: float,
+    overlays: List[TextOverlay],
+    codec: str = "libx264",
+    preset: str = "veryfast",
+    codec_params: Optional[List[str]] = None,
+    hwaccel: Optional[str] = None
+) -> None:
+    """
+    Render the final video with one ffmpeg filter graph.
+
+    Args:
+        background_path: Background video (looped if shorter than duration)
+        audio_path: Murotal audio file
+        output_path: Destination MP4 path
+        duration: Output video duration in seconds
+        audio_duration: Audio duration in seconds (for the fade out)
+        width: Output width
+        height: Output height
+        fps: Output frame rate
+        darken: Background brightness factor (0-1)
+        chrome: Full-frame RGBA lock screen chrome
+        chrome_fade: Chrome fade-in duration in seconds (0 for none)
+        overlays: Timed text overlays, composited in order
+        codec: ffmpeg video encoder
+        preset: Encoder preset
+        codec_params: Extra encoder arguments
+        hwaccel: Hardware decoder for the background (e.g. "cuda"), if any
+    """
+    bands = chrome_bands(chrome)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        args = ["-hwaccel", hwaccel] if hwaccel else []
+        args += [
+            "-stream_loop", "-1", "-i", str(background_path),
+            "-i", str(audio_path),
+        ]
+        images = [band for _, band in bands] + [overlay.image for overlay in overlays]
+        for i, image in enumerate(images):
+            image_png = Path(tmp_dir) / f"layer_{i}.png"
+            Image.fromarray(image).save(image_png, compress_level=1)
+            args += ["-framerate", str(fps), "-i", str(image_png)]
+
+        args += [
+            "-filter_complex", build_filter_graph(
+                width, height, fps, darken, duration, chrome_fade, [y for y, _ in bands], overlays
+            ),
+            "-map", "[vout]", "-map", "1:a:0",
+            "-af", audio_filter(audio_duration, duration),
+            "-c:v", codec, "-preset", preset,
+        ]
+        args += codec_params or []
+        args += [
+            # 0 lets libx264 size its own frame/lookahead threads (1.5x cores)
+            "-threads", "0",
+            "-r", str(fps),
+            "-t", f"{duration:.3f}",
+            "-c:a", "aac", "-b:a", "192k",
+            "-movflags", "+faststart",
+            str(output_path)
+        ]
+        run_ffmpeg(args)
@@ -0,0 +1,133 @@
+"""
+Per-frame pixel kernels for Quran Video Generator.
+
+Alpha-blends RGBA overlays onto video frames, optionally mapping the
+frame through a uint8 lookup table in the same pass. When Numba is
+installed the kernels are JIT-compiled into parallel loops that release
+the GIL, so concurrent render workers blend at the same time; otherwise
+equivalent vectorized NumPy code is used.
+"""
+
+import os
+
+import numpy as np
+
+try:
+    from numba import config as numba_config, njit, prange
+    NUMBA_AVAILABLE = True
+    # Kernels run on render worker threads; the TBB pool can hang interpreter
+    # shutdown when started off the main thread, so prefer OpenMP when present
+    if "NUMBA_THREADING_LAYER_PRIORITY" not in os.environ:
+        numba_config.THREADING_LAYER_PRIORITY = ["omp", "tbb", "workqueue"]
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+
+def _blend_rgba_over_rgb_numpy(
+    frame: np.ndarray,
+    overlay_rgb: np.ndarray,
+    overlay_alpha: np.ndarray,
+    out: np.ndarray,
+    opacity: int
+) -> np.ndarray:
+    """Vectorized NumPy fallback for blend_rgba_over_rgb."""
+    alpha = overlay_alpha[:, :, None].astype(np.uint16)
+    if opacity < 255:
+        alpha = alpha * opacity // 255
+    out[...] = (frame * (255 - alpha) + overlay_rgb * alpha) // 255
+    return out
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True, nogil=True)
+    def _blend_rgba_over_rgb_numba(frame, overlay_rgb, overlay_alpha, out, opacity):
+        """Numba kernel for blend_rgba_over_rgb (integer math, rows in parallel)."""
+        height, width, channels = frame.shape
+        for i in prange(height):
+            for j in range(width):
+                a = np.uint16(overlay_alpha[i, j]) * opacity // 255
+                for c in range(channels):
+                    out[i, j, c] = (frame[i, j, c] * (255 - a) + overlay_rgb[i, j, c] * a) // 255
+        return out
+
+
+def _darken_and_blend_numpy(frame, lut, overlay_rgb, overlay_alpha, rows, opacity, out):
+    """Vectorized NumPy fallback for darken_and_blend."""
+    out[...] = lut[frame]
+    alpha = (overlay_alpha[rows].astype(np.uint16) * opacity // 255)[:, :, None]
+    out[rows] = (out[rows] * (255 - alpha) + overlay_rgb[rows] * alpha) // 255
+    return out
+
+
+if NUMBA_AVAILABLE:
+    @njit(parallel=True, fastmath=True, cache=True, nogil=True)
+    def _darken_and_blend_numba(frame, lut, overlay_rgb, overlay_alpha, rows, opacity, out):
+        """Numba kernel for darken_and_blend (integer math, rows in parallel)."""
+        height, width, channels = frame.shape
+        for i in prange(height):
+            if not rows[i]:
+                for j in range(width):
+                    for c in range(channels):
+                        out[i, j, c] = lut[frame[i, j, c]]
+                continue
+            for j in range(width):
+                a = np.uint16(overlay_alpha[i, j]) * opacity // 255
+                for c in range(channels):
+                    out[i, j, c] = (lut[frame[i, j, c]] * (255 - a) + overlay_rgb[i, j, c] * a) // 255
+        return out
+
+
+def blend_rgba_over_rgb(
+    frame: np.ndarray,
+    overlay_rgb: np.ndarray,
+    overlay_alpha: np.ndarray,
+    out: np.ndarray,
+    opacity: int = 255
+) -> np.ndarray:
+    """
+    Alpha-blend an overlay onto an RGB frame using integer math.
+
+    Args:
+        frame: uint8 RGB frame region (H, W, 3)
+        overlay_rgb: uint8 overlay colors (H, W, 3)
+        overlay_alpha: uint8 overlay alpha (H, W)
+        out: uint8 output buffer (H, W, 3), may be the frame itself
+        opacity: Overlay opacity scale (0-255), applied inside the blend
+
+    Returns:
+        The out buffer
+    """
+    if NUMBA_AVAILABLE:
+        return _blend_rgba_over_rgb_numba(frame, overlay_rgb, overlay_alpha, out, np.uint16(opacity))
+    return _blend_rgba_over_rgb_numpy(frame, overlay_rgb, overlay_alpha, out, np.uint16(opacity))
+
+
+def darken_and_blend(
+    frame: np.ndarray,
+    lut: np.ndarray,
+    overlay_rgb: np.ndarray,
+    overlay_alpha: np.ndarray,
+    rows: np.ndarray,
+    opacity: int,
+    out: np.ndarray
+) -> np.ndarray:
+    """
+    Map a frame through a lookup table and alpha-blend an overlay in one pass.
+
+    Args:
+        frame: uint8 RGB frame (H, W, 3)
+        lut: uint8 table of length 256 applied to the frame
+        overlay_rgb: uint8 overlay colors (H, W, 3)
+        overlay_alpha: uint8 overlay alpha (H, W)
+        rows: bool (H,) marking rows with any visible overlay pixel
+        opacity: Overlay opacity scale (0-255)
+        out: uint8 output buffer (H, W, 3), must not be the frame itself
+
+    Returns:
+        The out buffer
+    """
+    if NUMBA_AVAILABLE:
+        return _darken_and_blend_numba(
+            np.ascontiguousarray(frame), lut, overlay_rgb, overlay_alpha, rows, np.uint16(opacity), out
+        )
+    return _darken_and_blend_numpy(frame, lut, overlay_rgb, overlay_alpha, rows, np.uint16(opacity), out)
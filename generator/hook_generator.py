@@ -1,5 +1,6 @@
 import random
 import urllib.parse
+import threading
 from typing import Optional
 import httpx
 
@@ -7,6 +8,12 @@ import httpx
 class HookGenerator:
     """Generate engaging viral hooks for video using AI"""
     
+    # Shared by every instance so the connection to the AI API is kept
+    # alive between hooks instead of paying a new TLS handshake each time.
+    # Created on first use, so a closed client is replaced on the next request
+    _http: Optional[httpx.Client] = None
+    _http_lock = threading.Lock()
+    
     def __init__(self):
         self.api_url = "https://api.elrayyxml.web.id/api/ai/chatgpt"
         
@@ -19,6 +26,14 @@ class HookGenerator:
             "Al-Quran punya pesan untukmu...",
         ]
     
+    @classmethod
+    def _client(cls) -> httpx.Client:
+        """Return the shared HTTP client, creating it on first use"""
+        with cls._http_lock:
+            if cls._http is None:
+                cls._http = httpx.Client(timeout=15.0, limits=httpx.Limits(max_keepalive_connections=4))
+            return cls._http
+    
     def _generate_with_ai(self, translation: str, surah_name: str) -> Optional[str]:
         """Generate hook using ElrayyXml ChatGPT API"""
         
@@ -41,7 +56,7 @@ Tulis HANYA hook-nya saja:"""
             encoded_prompt = urllib.parse.quote(prompt)
             url = f"{self.api_url}?text={encoded_prompt}"
             
-            response = httpx.get(url, timeout=15.0)
+            response = self._client().get(url)
             
             if response.status_code == 200:
                 data = response.json()
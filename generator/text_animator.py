@@ -8,6 +8,9 @@ from dataclasses import dataclass
 from typing import Callable, Optional
 from enum import Enum
 
+from moviepy.video.VideoClip import TextClip
+from moviepy.video.compositing.transitions import crossfadein, crossfadeout
+
 
 class AnimationType(Enum):
     """Types of text animations."""
@@ -59,19 +62,6 @@ class TextAnimator:
     MIN_FADE_DURATION = 0.3
     MAX_FADE_DURATION = 1.0
 
-    def __init__(self):
-        self._moviepy = None
-    
-    def _load_moviepy(self):
-        """Lazy load moviepy."""
-        if self._moviepy is None:
-            try:
-                import moviepy.editor as mpy
-                self._moviepy = mpy
-            except ImportError:
-                raise ImportError("moviepy is required for text animation")
-        return self._moviepy
-
     def validate_fade_duration(self, duration: float) -> float:
         """
         Validate and clamp fade duration to acceptable range.
@@ -84,6 +74,20 @@ class TextAnimator:
         """
         return max(self.MIN_FADE_DURATION, min(self.MAX_FADE_DURATION, duration))
 
+    def validate_optional_fade_duration(self, duration: float) -> float:
+        """
+        Validate fade duration, keeping an explicit 0 as "no fade".
+        
+        Args:
+            duration: Requested fade duration
+            
+        Returns:
+            0.0 when fade is disabled, otherwise the clamped duration
+        """
+        if duration <= 0:
+            return 0.0
+        return self.validate_fade_duration(duration)
+
     def calculate_opacity(
         self,
         current_time: float,
@@ -171,11 +175,9 @@ class TextAnimator:
         Returns:
             MoviePy TextClip with fade animations applied
         """
-        mpy = self._load_moviepy()
-        
-        # Validate fade durations
-        fade_in = self.validate_fade_duration(config.fade_in_duration)
-        fade_out = self.validate_fade_duration(config.fade_out_duration)
+        # Validate fade durations (0 skips the fade mask entirely)
+        fade_in = self.validate_optional_fade_duration(config.fade_in_duration)
+        fade_out = self.validate_optional_fade_duration(config.fade_out_duration)
         
         # Calculate clip duration
         clip_duration = config.end_time - config.start_time
@@ -183,7 +185,7 @@ class TextAnimator:
             raise ValueError("end_time must be greater than start_time")
         
         # Create base text clip
-        txt_clip = mpy.TextClip(
+        txt_clip = TextClip(
             config.text,
             fontsize=config.font_size,
             color=config.font_color,
@@ -201,11 +203,11 @@ class TextAnimator:
         
         # Apply fade-in effect
         if fade_in > 0:
-            txt_clip = txt_clip.crossfadein(fade_in)
+            txt_clip = crossfadein(txt_clip, fade_in)
         
         # Apply fade-out effect
         if fade_out > 0:
-            txt_clip = txt_clip.crossfadeout(fade_out)
+            txt_clip = crossfadeout(txt_clip, fade_out)
         
         return txt_clip
 
@@ -1,23 +1,173 @@
 import os
 import uuid
-import tempfile
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import subprocess
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from itertools import accumulate
+from contextlib import ExitStack, closing
 import numpy as np
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
-from datetime import datetime
-from PIL import Image, ImageDraw, ImageFont
-from hijri_converter import Hijri, Gregorian
+from typing import Dict, Any, List, Optional, Tuple
+from PIL import Image, ImageColor, ImageDraw, ImageFont
 
 # Fix for Pillow 10+ compatibility with moviepy
 import PIL.Image
 if not hasattr(PIL.Image, 'ANTIALIAS'):
     PIL.Image.ANTIALIAS = PIL.Image.LANCZOS
 
-from moviepy.editor import VideoFileClip, AudioFileClip, ImageClip, CompositeVideoClip, vfx
-from api.config import VIDEOS_DIR, VIDEO_WIDTH, VIDEO_HEIGHT, VIDEO_FPS, DATA_DIR
+# Import the clip classes directly: moviepy.editor also loads every effect,
+# the preview tools and IPython, which dominated generator import time
+from moviepy.video.VideoClip import VideoClip
+from moviepy.video.io.VideoFileClip import VideoFileClip
+from moviepy.audio.io.AudioFileClip import AudioFileClip
+from moviepy.video.fx.loop import loop
+from moviepy.video.compositing.transitions import crossfadein
+from moviepy.config import get_setting
+from api.config import (
+    VIDEOS_DIR, VIDEO_WIDTH, VIDEO_HEIGHT, VIDEO_FPS, VIDEO_CODEC, VIDEO_PRESET,
+    VIDEO_RENDERER, VIDEO_WORKERS
+)
 
 # Import audio sync service for text-audio synchronization
 from generator.audio_sync import get_audio_sync_service, TextTiming
+from generator.frame_blend import blend_rgba_over_rgb, darken_and_blend
+from generator.ffmpeg_compositor import (
+    PortraitVideoClip, TextOverlay, composite_video, crop_transparent_margins, encode_frames,
+    merge_concurrent_overlays
+)
+
+# Worker pool for blocking render work, shared by all generator instances
+# so concurrent requests never block the event loop
+_RENDER_EXECUTOR = ThreadPoolExecutor(max_workers=VIDEO_WORKERS, thread_name_prefix="render")
+
+# Short backgrounds whose processed frames fit in this many bytes are decoded
+# once and served from memory, so loops and later batch jobs never re-decode
+_BACKGROUND_BUFFER_BYTES = 512 * 1024 * 1024
+
+# Font registry keyed by (font_path, size), shared by every generator
+# instance. A FreeType face must not be used by two threads at once, and
+# render workers measure and draw text concurrently, so each thread keeps
+# its own instances: a TTF is parsed once per worker thread and size
+_FONT_CACHE = threading.local()
+
+
+def _load_font(font_path: str, size: int) -> ImageFont.FreeTypeFont:
+    """Load TrueType font, reusing this thread's cached instance when available"""
+    fonts = getattr(_FONT_CACHE, 'fonts', None)
+    if fonts is None:
+        fonts = _FONT_CACHE.fonts = {}
+    key = (font_path, size)
+    font = fonts.get(key)
+    if font is None:
+        font = ImageFont.truetype(font_path, size)
+        fonts[key] = font
+    return font
+
+
+# Rendered text images keyed by their render arguments, shared by every
+# generator instance (one is created per job) and bounded LRU-style since
+# ayat texts rarely repeat while watermark/reference styles always do
+_TEXT_IMAGES: "OrderedDict[tuple, np.ndarray]" = OrderedDict()
+_TEXT_IMAGES_MAX = 512
+_TEXT_IMAGES_LOCK = threading.Lock()
+
+
+def _cached_text_image(key: tuple) -> Optional[np.ndarray]:
+    """Look up a rendered text image, marking it as recently used"""
+    with _TEXT_IMAGES_LOCK:
+        img = _TEXT_IMAGES.get(key)
+        if img is not None:
+            _TEXT_IMAGES.move_to_end(key)
+        return img
+
+
+# Lock screen chrome layers keyed by frame size; the layer never changes,
+# so every generator instance (one per job) shares it
+_CHROME_OVERLAYS: Dict[tuple, np.ndarray] = {}
+_CHROME_OVERLAYS_LOCK = threading.Lock()
+
+# Font file chosen for each (font path list, size), so the os.path.exists
+# probing in VideoGenerator._get_font runs once per process (None means
+# no font file loaded and PIL's default font is used)
+_RESOLVED_FONTS: Dict[Tuple[Tuple[str, ...], int], Optional[str]] = {}
+_RESOLVED_FONTS_LOCK = threading.Lock()
+
+@lru_cache(maxsize=4096)
+def _text_length(font: ImageFont.FreeTypeFont, text: str) -> float:
+    """
+    Advance width of text, cached per font instance.
+    
+    Fonts are reused through _FONT_CACHE, so words that recur across lines
+    and ayat of a batch are shaped by FreeType only once per font. Each
+    font belongs to one thread, so a face is only ever measured there.
+    """
+    return font.getlength(text)
+
+
+# Drawing context on a 1x1 image, only used to measure text bounding boxes
+# (measuring never touches the image, so one context serves every call)
+_MEASURE_DRAW = ImageDraw.Draw(Image.new('RGBA', (1, 1)))
+
+
+# Hardware H.264 encoders in preference order, with (preset, extra params).
+# yuv420p/nv12 keep the output playable on phones
+_HW_ENCODERS: Dict[str, Tuple[str, List[str]]] = {
+    'h264_nvenc': ('p4', ['-tune', 'hq', '-rc', 'vbr', '-cq', '23', '-pix_fmt', 'yuv420p']),
+    # VideoToolbox has no presets; ffmpeg ignores the option for it
+    'h264_videotoolbox': ('medium', ['-q:v', '60', '-pix_fmt', 'yuv420p']),
+    'h264_qsv': ('veryfast', ['-global_quality', '23', '-pix_fmt', 'nv12']),
+}
+
+# Matching ffmpeg -hwaccel decoder for encoders whose device can also
+# decode the background (frames are copied back for the filter chain)
+_HW_DECODERS: Dict[str, str] = {
+    'h264_nvenc': 'cuda',
+    'h264_videotoolbox': 'videotoolbox',
+}
+
+_HW_ENCODER: Optional[str] = None
+_HW_ENCODER_PROBED = False
+# Render workers can ask for the encoder concurrently; the first one probes
+# while the rest wait for its answer
+_HW_ENCODER_LOCK = threading.Lock()
+
+
+def _hardware_encoder() -> Optional[str]:
+    """
+    Find once the first hardware encoder that can actually encode here.
+    
+    Being listed by `ffmpeg -encoders` only means ffmpeg was built with it,
+    so each candidate is confirmed with a one-frame test encode.
+    """
+    global _HW_ENCODER, _HW_ENCODER_PROBED
+    with _HW_ENCODER_LOCK:
+        if _HW_ENCODER_PROBED:
+            return _HW_ENCODER
+        ffmpeg = get_setting("FFMPEG_BINARY")
+        try:
+            listed = subprocess.run(
+                [ffmpeg, "-hide_banner", "-encoders"],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, timeout=10
+            ).stdout
+            for codec in _HW_ENCODERS:
+                if codec.encode() not in listed:
+                    continue
+                result = subprocess.run(
+                    [ffmpeg, "-hide_banner", "-loglevel", "error",
+                     "-f", "lavfi", "-i", "color=c=black:s=256x256:d=0.1",
+                     "-frames:v", "1", "-c:v", codec, "-f", "null", "-"],
+                    stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=20
+                )
+                if result.returncode == 0:
+                    _HW_ENCODER = codec
+                    break
+        except Exception as e:
+            print(f"Hardware encoder detection failed: {e}")
+        _HW_ENCODER_PROBED = True
+        return _HW_ENCODER
 
 
 class VideoGenerator:
@@ -26,25 +176,16 @@ class VideoGenerator:
         self.width = VIDEO_WIDTH
         self.height = VIDEO_HEIGHT
         self.fps = VIDEO_FPS
-        self.logo_path = DATA_DIR / "assets" / "logo.png"
         self.min_video_duration = 10.0  # Minimum total video duration in seconds
         self.watermark_text = "@ruang.ayat"
         self.watermark_opacity = 0.4  # 40% opacity for better visibility
         self.fade_duration = 0.8  # Fade in/out duration in seconds
         self.bg_darken = 0.55  # Background darken level (55% brightness)
+        # 256-entry lookup table so darkening stays in uint8 (no float frame)
+        self._darken_lut = (np.arange(256) * self.bg_darken).astype(np.uint8)
         
         # Audio sync service for text-audio synchronization
         self.audio_sync = get_audio_sync_service()
-        # Indonesian day names
-        self.day_names_id = ['Senin', 'Selasa', 'Rabu', 'Kamis', 'Jumat', 'Sabtu', 'Ahad']
-        self.day_names_en = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
-        # Indonesian month names
-        self.month_names_id = ['Januari', 'Februari', 'Maret', 'April', 'Mei', 'Juni', 
-                               'Juli', 'Agustus', 'September', 'Oktober', 'November', 'Desember']
-        # Hijri month names
-        self.hijri_months = ['Muharram', 'Safar', 'Rabiul Awal', 'Rabiul Akhir', 
-                            'Jumadil Awal', 'Jumadil Akhir', 'Rajab', 'Syaban',
-                            'Ramadhan', 'Syawal', 'Dzulqaidah', 'Dzulhijjah']
         # Font paths for regular text
         self.font_paths = [
             "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
@@ -64,12 +205,25 @@ class VideoGenerator:
         ]
     
     def _get_font(self, size: int, arabic: bool = False) -> ImageFont.FreeTypeFont:
-        """Get available font"""
+        """Get available font (resolved once per font list and size)"""
         font_list = self.arabic_font_paths if arabic else self.font_paths
+        key = (tuple(font_list), size)
+        with _RESOLVED_FONTS_LOCK:
+            if key not in _RESOLVED_FONTS:
+                _RESOLVED_FONTS[key] = self._find_font_path(font_list, size)
+            font_path = _RESOLVED_FONTS[key]
+        if font_path is None:
+            # Last resort - use default font
+            return ImageFont.load_default()
+        return _load_font(font_path, size)
+    
+    def _find_font_path(self, font_list: List[str], size: int) -> Optional[str]:
+        """Find the first loadable font in font_list, falling back to system fonts"""
         for font_path in font_list:
             if os.path.exists(font_path):
                 try:
-                    return ImageFont.truetype(font_path, size)
+                    _load_font(font_path, size)
+                    return font_path
                 except Exception:
                     continue
         # Fallback to DejaVu (always available in Docker)
@@ -80,47 +234,11 @@ class VideoGenerator:
         for fallback in fallback_paths:
             if os.path.exists(fallback):
                 try:
-                    return ImageFont.truetype(fallback, size)
+                    _load_font(fallback, size)
+                    return fallback
                 except Exception:
                     continue
-        # Last resort - use default font
-        return ImageFont.load_default()
-    
-    def _create_text_image(
-        self,
-        text: str,
-        fontsize: int,
-        color: str = 'white',
-        max_width: int = None,
-        arabic: bool = False
-    ) -> np.ndarray:
-        """Create text image using PIL (no ImageMagick needed)"""
-        if max_width is None:
-            max_width = self.width - 100
-        
-        font = self._get_font(fontsize, arabic=arabic)
-        
-        # Wrap text
-        wrapped_text = self._wrap_text_pil(text, font, max_width)
-        
-        # Calculate image size
-        dummy_img = Image.new('RGBA', (1, 1))
-        draw = ImageDraw.Draw(dummy_img)
-        bbox = draw.multiline_textbbox((0, 0), wrapped_text, font=font)
-        text_width = bbox[2] - bbox[0] + 40
-        text_height = bbox[3] - bbox[1] + 40
-        
-        # Create image with transparent background
-        img = Image.new('RGBA', (text_width, text_height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        
-        # Draw text with shadow for better visibility
-        shadow_offset = 2
-        draw.multiline_text((20 + shadow_offset, 20 + shadow_offset), wrapped_text, 
-                           font=font, fill=(0, 0, 0, 180), align='center')
-        draw.multiline_text((20, 20), wrapped_text, font=font, fill=color, align='center')
-        
-        return np.array(img)
+        return None
     
     def _create_aesthetic_text(
         self,
@@ -128,70 +246,80 @@ class VideoGenerator:
         fontsize: int,
         color: str = 'white',
         max_width: int = None,
-        arabic: bool = False,
-        italic_style: bool = False
+        arabic: bool = False
     ) -> np.ndarray:
         """Create aesthetic text with soft shadow for wallpaper-style look"""
         if max_width is None:
             max_width = self.width - 80  # More padding for aesthetic
         
+        cache_key = ('aesthetic', text, fontsize, color, max_width, arabic)
+        cached = _cached_text_image(cache_key)
+        if cached is not None:
+            return cached
+        
         font = self._get_font(fontsize, arabic=arabic)
         
         # Wrap text
         wrapped_text = self._wrap_text_pil(text, font, max_width)
         
         # Calculate image size
-        dummy_img = Image.new('RGBA', (1, 1))
-        draw = ImageDraw.Draw(dummy_img)
-        bbox = draw.multiline_textbbox((0, 0), wrapped_text, font=font)
+        bbox = _MEASURE_DRAW.multiline_textbbox((0, 0), wrapped_text, font=font)
         text_width = bbox[2] - bbox[0] + 60
         text_height = bbox[3] - bbox[1] + 50
         
-        # Create image with transparent background
-        img = Image.new('RGBA', (text_width, text_height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        
-        # Draw soft shadow (multiple layers for blur effect)
+        # Soft shadow (multiple layers for blur effect), then main text
         shadow_color = (0, 0, 0, 60)
-        for offset in [(3, 3), (2, 2), (4, 4)]:
-            draw.multiline_text((30 + offset[0], 25 + offset[1]), wrapped_text, 
-                               font=font, fill=shadow_color, align='center')
+        layers = [(offset, shadow_color) for offset in [(3, 3), (2, 2), (4, 4)]]
+        layers.append(((0, 0), color))
+        img = self._render_text_layers((text_width, text_height), wrapped_text, font, (30, 25), layers)
         
-        # Draw main text
-        draw.multiline_text((30, 25), wrapped_text, font=font, fill=color, align='center')
-        
-        return np.array(img)
+        return self._cache_text_image(cache_key, img)
     
-    def _get_calendar_info(self) -> Dict[str, str]:
-        """Get current date info in Masehi and Hijriah"""
-        now = datetime.now()
-        
-        # Day name
-        day_idx = now.weekday()
-        day_id = self.day_names_id[day_idx]
-        day_en = self.day_names_en[day_idx]
-        
-        # Masehi date
-        masehi_day = now.day
-        masehi_month = self.month_names_id[now.month - 1]
-        masehi_year = now.year
-        
-        # Hijriah date
-        hijri = Gregorian(now.year, now.month, now.day).to_hijri()
-        hijri_day = hijri.day
-        hijri_month = self.hijri_months[hijri.month - 1]
-        hijri_year = hijri.year
+    def _render_text_layers(
+        self,
+        size: Tuple[int, int],
+        wrapped_text: str,
+        font: ImageFont.FreeTypeFont,
+        origin: Tuple[int, int],
+        layers: List[Tuple[Tuple[int, int], Any]]
+    ) -> Image.Image:
+        """
+        Rasterize text once and paint it as offset layers (shadows, then fill).
         
-        return {
-            'day_id': day_id,
-            'day_en': day_en,
-            'masehi_day': masehi_day,
-            'masehi_month': masehi_month,
-            'masehi_year': masehi_year,
-            'hijri_day': hijri_day,
-            'hijri_month': hijri_month,
-            'hijri_year': hijri_year
-        }
+        Pasting a solid color through the glyph mask is what draw.text does
+        internally, so this matches drawing the text once per layer while
+        running FreeType/Raqm layout only a single time.
+        
+        Args:
+            size: Image (width, height)
+            wrapped_text: Text with line breaks already applied
+            font: Font to render with
+            origin: Top-left text position for the (0, 0) layer
+            layers: List of ((dx, dy), color) painted in order
+            
+        Returns:
+            RGBA PIL image
+        """
+        width, height = size
+        mask = Image.new('L', size, 0)
+        ImageDraw.Draw(mask).multiline_text(origin, wrapped_text, font=font, fill=255, align='center')
+        
+        img = Image.new('RGBA', size, (0, 0, 0, 0))
+        for (dx, dy), color in layers:
+            ink = ImageColor.getcolor(color, 'RGBA') if isinstance(color, str) else color
+            layer_mask = mask if (dx, dy) == (0, 0) else mask.crop((-dx, -dy, width - dx, height - dy))
+            img.paste(ink, (0, 0, width, height), layer_mask)
+        return img
+    
+    def _cache_text_image(self, cache_key: tuple, img: Image.Image) -> np.ndarray:
+        """Store rendered text as a read-only array shared by later identical calls"""
+        arr = np.asarray(img)
+        arr.flags.writeable = False
+        with _TEXT_IMAGES_LOCK:
+            _TEXT_IMAGES[cache_key] = arr
+            if len(_TEXT_IMAGES) > _TEXT_IMAGES_MAX:
+                _TEXT_IMAGES.popitem(last=False)
+        return arr
     
     def _create_status_bar(self) -> np.ndarray:
         """Create iPhone-style status bar with signal, 5G, battery (right side only)"""
@@ -231,24 +359,7 @@ class VideoGenerator:
             by = y_center + 14 - h
             draw.rounded_rectangle([(bx, by), (bx + 3, y_center + 14)], radius=1, fill=(255, 255, 255, 255))
         
-        return np.array(img)
-    
-    def _create_lock_icon(self) -> np.ndarray:
-        """Create lock icon for lock screen"""
-        icon_size = 50
-        img = Image.new('RGBA', (icon_size, icon_size), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        
-        # Draw lock icon using shapes
-        # Lock body (rounded rectangle)
-        draw.rounded_rectangle([(10, 22), (40, 45)], radius=5, fill=(255, 255, 255, 200))
-        # Lock shackle (arc)
-        draw.arc([(15, 8), (35, 28)], start=180, end=0, fill=(255, 255, 255, 200), width=4)
-        # Keyhole
-        draw.ellipse([(22, 28), (28, 34)], fill=(0, 0, 0, 150))
-        draw.rectangle([(24, 32), (26, 40)], fill=(0, 0, 0, 150))
-        
-        return np.array(img)
+        return np.asarray(img)
     
     def _create_bottom_bar(self) -> np.ndarray:
         """Create iPhone-style bottom bar with flashlight and camera icons"""
@@ -301,7 +412,7 @@ class VideoGenerator:
         
         # Center hint text
         hint_text = "Swipe up to open"
-        hint_bbox = draw.textbbox((0, 0), hint_text, font=font_hint)
+        hint_bbox = _MEASURE_DRAW.textbbox((0, 0), hint_text, font=font_hint)
         hint_width = hint_bbox[2] - hint_bbox[0]
         draw.text((bar_width // 2 - hint_width // 2, button_y + 60), hint_text, 
                  font=font_hint, fill=(255, 255, 255, 120))
@@ -316,71 +427,29 @@ class VideoGenerator:
             fill=(255, 255, 255, 200)
         )
         
-        return np.array(img)
-    
-    def _create_calendar_overlay(self) -> np.ndarray:
-        """Create calendar overlay - Hari, Tanggal Masehi, Tanggal Hijriah"""
-        cal = self._get_calendar_info()
-        
-        # Create canvas
-        cal_width = self.width
-        cal_height = 140
-        img = Image.new('RGBA', (cal_width, cal_height), (0, 0, 0, 0))
-        draw = ImageDraw.Draw(img)
-        
-        # Fonts
-        font_day = self._get_font(32)        # Hari (Jumat)
-        font_masehi = self._get_font(24)     # Tanggal Masehi
-        font_hijri = self._get_font(20)      # Tanggal Hijriah
-        
-        # Helper function to draw text with soft shadow
-        def draw_text_shadow(pos, text, font, color=(255, 255, 255, 255)):
-            x, y = pos
-            shadow_color = (0, 0, 0, 60)
-            draw.text((x + 2, y + 2), text, font=font, fill=shadow_color)
-            draw.text((x, y), text, font=font, fill=color)
-        
-        center_x = cal_width // 2
-        
-        # Line 1: Hari (Jumat)
-        day_text = cal['day_id']
-        day_bbox = draw.textbbox((0, 0), day_text, font=font_day)
-        day_width = day_bbox[2] - day_bbox[0]
-        draw_text_shadow((center_x - day_width // 2, 10), day_text, font_day)
-        
-        # Line 2: Tanggal Masehi (5 Desember 2025)
-        masehi_text = f"{cal['masehi_day']} {cal['masehi_month']} {cal['masehi_year']}"
-        masehi_bbox = draw.textbbox((0, 0), masehi_text, font=font_masehi)
-        masehi_width = masehi_bbox[2] - masehi_bbox[0]
-        draw_text_shadow((center_x - masehi_width // 2, 50), masehi_text, font_masehi)
-        
-        # Line 3: Tanggal Hijriah (5 Jumadil Akhir 1447 H)
-        hijri_text = f"{cal['hijri_day']} {cal['hijri_month']} {cal['hijri_year']} H"
-        hijri_bbox = draw.textbbox((0, 0), hijri_text, font=font_hijri)
-        hijri_width = hijri_bbox[2] - hijri_bbox[0]
-        draw_text_shadow((center_x - hijri_width // 2, 90), hijri_text, font_hijri, (200, 200, 200, 255))
-        
-        return np.array(img)
-
+        return np.asarray(img)
     
     def _wrap_text_pil(self, text: str, font: ImageFont.FreeTypeFont, max_width: int) -> str:
         """Wrap text to fit within max_width using PIL"""
         words = text.split()
         lines = []
         current_line = []
+        current_width = 0.0
         
-        dummy_img = Image.new('RGBA', (1, 1))
-        draw = ImageDraw.Draw(dummy_img)
+        # Advance widths are additive, so measure each word once
+        space_width = _text_length(font, ' ')
         
         for word in words:
-            test_line = ' '.join(current_line + [word])
-            bbox = draw.textbbox((0, 0), test_line, font=font)
-            if bbox[2] - bbox[0] <= max_width:
+            word_width = _text_length(font, word)
+            line_width = current_width + (space_width if current_line else 0) + word_width
+            if line_width <= max_width:
                 current_line.append(word)
+                current_width = line_width
             else:
                 if current_line:
                     lines.append(' '.join(current_line))
                 current_line = [word]
+                current_width = word_width
         
         if current_line:
             lines.append(' '.join(current_line))
@@ -423,23 +492,12 @@ class VideoGenerator:
         if len(words) <= num_segments:
             return [text]  # Too short to split
         
-        # Calculate words per segment
-        words_per_segment = len(words) // num_segments
-        remainder = len(words) % num_segments
-        
-        segments = []
-        start_idx = 0
+        # Earlier segments take one extra word each until the remainder is used up
+        words_per_segment, remainder = divmod(len(words), num_segments)
+        sizes = [words_per_segment + 1] * remainder + [words_per_segment] * (num_segments - remainder)
+        offsets = [0, *accumulate(sizes)]
         
-        for i in range(num_segments):
-            # Add extra word to earlier segments if there's remainder
-            extra = 1 if i < remainder else 0
-            end_idx = start_idx + words_per_segment + extra
-            
-            segment_words = words[start_idx:end_idx]
-            if segment_words:
-                segments.append(' '.join(segment_words))
-            
-            start_idx = end_idx
+        segments = [' '.join(words[start:end]) for start, end in zip(offsets, offsets[1:])]
         
         return segments
 
@@ -466,7 +524,7 @@ class VideoGenerator:
             text_translation: Indonesian translation text
             
         Returns:
-            List of ImageClip objects
+            List of TextOverlay specs
         """
         if not word_timings:
             return None
@@ -537,11 +595,9 @@ class VideoGenerator:
             line_text = " ".join([w[1] for w in line_words])
             line_img = self._create_aesthetic_text(line_text, fontsize=fontsize, color='white', arabic=True)
             
-            line_clip = ImageClip(line_img).set_duration(clip_duration)
-            line_clip = line_clip.set_start(line_start)
-            line_clip = line_clip.set_position(('center', base_y))
-            line_clip = line_clip.crossfadein(fade_duration)
-            line_clip = line_clip.crossfadeout(fade_duration)
+            line_clip = TextOverlay(
+                line_img, start=line_start, duration=clip_duration, y=base_y, fade=fade_duration
+            )
             clips.append(line_clip)
             
             # Create translation clip (below Arabic, same timing)
@@ -552,11 +608,9 @@ class VideoGenerator:
                     color='#E0E0E0',  # Slightly dimmer white
                     arabic=False
                 )
-                trans_clip = ImageClip(trans_img).set_duration(clip_duration)
-                trans_clip = trans_clip.set_start(line_start)
-                trans_clip = trans_clip.set_position(('center', trans_y))
-                trans_clip = trans_clip.crossfadein(fade_duration)
-                trans_clip = trans_clip.crossfadeout(fade_duration)
+                trans_clip = TextOverlay(
+                    trans_img, start=line_start, duration=clip_duration, y=trans_y, fade=fade_duration
+                )
                 clips.append(trans_clip)
         
         return clips if clips else None
@@ -610,7 +664,7 @@ class VideoGenerator:
             num_segments: Number of segments (auto-calculated if None)
             
         Returns:
-            List of ImageClip objects
+            List of TextOverlay specs
         """
         # Auto-calculate segments if not specified
         if num_segments is None:
@@ -636,11 +690,9 @@ class VideoGenerator:
             
             # Create Arabic text clip
             arab_img = self._create_aesthetic_text(arab_text, fontsize=fontsize, color='white', arabic=True)
-            arab_clip = ImageClip(arab_img).set_duration(clip_duration)
-            arab_clip = arab_clip.set_start(seg_start)
-            arab_clip = arab_clip.set_position(('center', base_y))
-            arab_clip = arab_clip.crossfadein(fade_duration)
-            arab_clip = arab_clip.crossfadeout(fade_duration)
+            arab_clip = TextOverlay(
+                arab_img, start=seg_start, duration=clip_duration, y=base_y, fade=fade_duration
+            )
             clips.append(arab_clip)
             
             # Create translation clip (same timing as Arabic)
@@ -651,84 +703,13 @@ class VideoGenerator:
                     color='#E0E0E0',
                     arabic=False
                 )
-                trans_clip = ImageClip(trans_img).set_duration(clip_duration)
-                trans_clip = trans_clip.set_start(seg_start)
-                trans_clip = trans_clip.set_position(('center', trans_y))
-                trans_clip = trans_clip.crossfadein(fade_duration)
-                trans_clip = trans_clip.crossfadeout(fade_duration)
+                trans_clip = TextOverlay(
+                    trans_img, start=seg_start, duration=clip_duration, y=trans_y, fade=fade_duration
+                )
                 clips.append(trans_clip)
         
         return clips if clips else None
 
-    def _create_segment_clips(
-        self,
-        text: str,
-        audio_duration: float,
-        base_y: int,
-        fontsize: int = 52,
-        arabic: bool = True,
-        num_segments: int = 3
-    ) -> list:
-        """
-        Create multiple text clips that appear segment by segment.
-        
-        Args:
-            text: Full text to display
-            audio_duration: Total audio duration
-            base_y: Base Y position for text
-            fontsize: Font size
-            arabic: Whether text is Arabic
-            num_segments: Number of segments
-            
-        Returns:
-            List of ImageClip objects
-        """
-        segments = self._split_text_into_segments(text, num_segments)
-        if len(segments) <= 1:
-            # Single segment, use normal display
-            return None
-        
-        clips = []
-        fade_duration = 0.5
-        
-        # Calculate timing for each segment
-        # Reserve 80% of audio for Arabic segments, last 20% for all visible
-        arab_display_time = audio_duration * 0.8
-        segment_duration = arab_display_time / len(segments)
-        
-        # Calculate vertical spacing
-        segment_heights = []
-        for seg_text in segments:
-            seg_img = self._create_aesthetic_text(seg_text, fontsize=fontsize, color='white', arabic=arabic)
-            segment_heights.append(seg_img.shape[0])
-        
-        total_height = sum(segment_heights) + (len(segments) - 1) * 15  # 15px gap between segments
-        
-        # Center vertically around base_y
-        current_y = base_y - total_height // 2 + segment_heights[0] // 2
-        
-        for i, seg_text in enumerate(segments):
-            seg_img = self._create_aesthetic_text(seg_text, fontsize=fontsize, color='white', arabic=arabic)
-            
-            # Calculate timing for this segment
-            seg_start = i * segment_duration
-            seg_end = audio_duration  # All segments stay until end
-            
-            # Create clip
-            clip_duration = seg_end - seg_start
-            seg_clip = ImageClip(seg_img).set_duration(clip_duration)
-            seg_clip = seg_clip.set_start(seg_start)
-            seg_clip = seg_clip.set_position(('center', current_y))
-            seg_clip = seg_clip.crossfadein(fade_duration)
-            seg_clip = seg_clip.crossfadeout(fade_duration)
-            
-            clips.append(seg_clip)
-            
-            # Move to next position
-            current_y += segment_heights[i] + 15
-        
-        return clips
-
     def parse_srt(self, srt_content: str) -> list:
         """
         Parse SRT subtitle content into list of segments.
@@ -790,7 +771,7 @@ class VideoGenerator:
             translation_segments: Optional translation SRT segments
             
         Returns:
-            List of ImageClip objects
+            List of TextOverlay specs
         """
         clips = []
         fade_duration = 0.15
@@ -812,11 +793,9 @@ class VideoGenerator:
                 color='white',
                 arabic=arabic
             )
-            text_clip = ImageClip(text_img).set_duration(clip_duration)
-            text_clip = text_clip.set_start(start_sec)
-            text_clip = text_clip.set_position(('center', base_y))
-            text_clip = text_clip.crossfadein(fade_duration)
-            text_clip = text_clip.crossfadeout(fade_duration)
+            text_clip = TextOverlay(
+                text_img, start=start_sec, duration=clip_duration, y=base_y, fade=fade_duration
+            )
             clips.append(text_clip)
             
             # Add translation if available
@@ -828,11 +807,9 @@ class VideoGenerator:
                     color='#E0E0E0',
                     arabic=False
                 )
-                trans_clip = ImageClip(trans_img).set_duration(clip_duration)
-                trans_clip = trans_clip.set_start(start_sec)
-                trans_clip = trans_clip.set_position(('center', trans_y))
-                trans_clip = trans_clip.crossfadein(fade_duration)
-                trans_clip = trans_clip.crossfadeout(fade_duration)
+                trans_clip = TextOverlay(
+                    trans_img, start=start_sec, duration=clip_duration, y=trans_y, fade=fade_duration
+                )
                 clips.append(trans_clip)
         
         return clips if clips else None
@@ -845,6 +822,22 @@ class VideoGenerator:
         translation_srt: str = None,
         surah_name: str = "Unknown",
         ayat_number: int = 0
+    ) -> Dict[str, Any]:
+        """Generate video using SRT subtitles, rendered on the render worker pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _RENDER_EXECUTOR, self._generate_video_from_srt_sync,
+            background_path, audio_path, arabic_srt, translation_srt, surah_name, ayat_number
+        )
+
+    def _generate_video_from_srt_sync(
+        self,
+        background_path: str,
+        audio_path: str,
+        arabic_srt: str,
+        translation_srt: str = None,
+        surah_name: str = "Unknown",
+        ayat_number: int = 0
     ) -> Dict[str, Any]:
         """
         Generate video using SRT subtitles for precise timing.
@@ -868,82 +861,48 @@ class VideoGenerator:
         output_path = self.output_dir / output_filename
         
         try:
-            video = VideoFileClip(background_path)
-            audio = AudioFileClip(audio_path)
-            audio_duration = audio.duration
-            
-            # Add padding and fade out to prevent crackling
-            audio_padding = 1.0
-            video_duration = audio_duration + audio_padding
-            audio = audio.audio_fadeout(0.5)
-            
-            video = self._resize_to_portrait(video)
-            if video.duration < video_duration:
-                video = video.loop(duration=video_duration)
-            else:
-                video = video.subclip(0, video_duration)
-            video = video.fl_image(self._darken_frame)
-            
-            # Create UI elements (calendar/date removed)
-            status_bar_img = self._create_status_bar()
-            bottom_bar_img = self._create_bottom_bar()
-            
-            content_start = int(self.height * 0.20)  # Adjusted since no calendar
-            content_end = self.height - 150
-            arab_y = content_start + 150
-            
-            # Create SRT-based clips
-            srt_clips = self._create_srt_clips(
-                arabic_segments,
-                base_y=arab_y,
-                fontsize=56,
-                arabic=True,
-                translation_segments=trans_segments
-            )
-            
-            # Create reference
-            surah_ref = f"— QS. {surah_name}: {ayat_number}"
-            ref_img = self._create_aesthetic_text(surah_ref, fontsize=22, color='#D4C4A8')
-            ref_y = content_end - 60
-            ref_clip = ImageClip(ref_img).set_duration(video_duration)
-            ref_clip = ref_clip.set_start(0)
-            ref_clip = ref_clip.set_position(('center', ref_y))
-            ref_clip = ref_clip.crossfadein(0.5)
-            ref_clip = ref_clip.crossfadeout(0.5)
-            
-            # Create UI clips (calendar removed)
-            status_bar_clip = ImageClip(status_bar_img).set_duration(video_duration)
-            status_bar_clip = status_bar_clip.set_position(('center', 10))
-            bottom_bar_clip = ImageClip(bottom_bar_img).set_duration(video_duration)
-            bottom_bar_clip = bottom_bar_clip.set_position(('center', self.height - 100))
-            
-            clips = [video, status_bar_clip]
-            if srt_clips:
-                clips.extend(srt_clips)
-            clips.extend([ref_clip, bottom_bar_clip])
-            
-            watermark_clip = self._create_watermark_clip(video_duration)
-            clips.append(watermark_clip)
-            
-            final = CompositeVideoClip(clips)
-            final = final.set_audio(audio)
-            final = final.crossfadein(self.fade_duration)
-            
-            final.write_videofile(
-                str(output_path),
-                fps=self.fps,
-                codec='libx264',
-                audio_codec='aac',
-                audio_bitrate='192k',
-                threads=4,
-                preset='medium',
-                logger=None
-            )
+            with ExitStack() as stack:
+                source = stack.enter_context(closing(self._open_background(background_path)))
+                # Audio plus 1s padding (fade out is applied when the audio is muxed)
+                audio_duration, video_duration = self._probe_durations(audio_path)
+                
+                if source.duration < video_duration:
+                    video = loop(self._buffer_background(source), duration=video_duration)
+                else:
+                    video = source.subclip(0, video_duration)
+                
+                # Darken and blend UI elements as one static layer (calendar/date removed)
+                video = video.fl(self._make_chrome_blender(self._create_chrome_overlay(), 0))
+                
+                content_start = int(self.height * 0.20)  # Adjusted since no calendar
+                content_end = self.height - 150
+                arab_y = content_start + 150
+                
+                # Create SRT-based clips
+                srt_clips = self._create_srt_clips(
+                    arabic_segments,
+                    base_y=arab_y,
+                    fontsize=56,
+                    arabic=True,
+                    translation_segments=trans_segments
+                )
+                
+                # Create reference
+                surah_ref = f"— QS. {surah_name}: {ayat_number}"
+                ref_img = self._create_aesthetic_text(surah_ref, fontsize=22, color='#D4C4A8')
+                ref_y = content_end - 60
+                ref_clip = TextOverlay(
+                    ref_img, start=0, duration=video_duration, y=ref_y, fade=0.5
+                )
+                
+                watermark_clip = self._create_watermark_overlay(video_duration)
+                overlays = merge_concurrent_overlays(
+                    [crop_transparent_margins(o) for o in (srt_clips or []) + [ref_clip, watermark_clip]], self.width
+                )
+                final = video.fl(self._make_overlay_blender(overlays))
+                self._write_output(crossfadein(final, self.fade_duration), output_path, audio_path, audio_duration)
             
             file_size = os.path.getsize(output_path)
-            video.close()
-            audio.close()
-            final.close()
             
             return {
                 "output_file": str(output_path),
@@ -966,223 +925,374 @@ class VideoGenerator:
         word_timings: list = None
     ) -> Dict[str, Any]:
         """Generate aesthetic wallpaper-style video with background and text overlay synchronized with audio"""
+        results = await self.generate_video_batch(background_path, [{
+            "audio_path": audio_path,
+            "text_arab": text_arab,
+            "text_translation": text_translation,
+            "surah_name": surah_name,
+            "ayat_number": ayat_number,
+            "word_timings": word_timings
+        }])
+        return results[0]
+
+    async def generate_video_batch(
+        self,
+        background_path: str,
+        jobs: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate multiple ayat videos on one background.
         
-        output_filename = f"quran_{surah_name}_{ayat_number}_{uuid.uuid4().hex[:8]}.mp4"
-        output_path = self.output_dir / output_filename
+        Each job is rendered by a single ffmpeg filter graph. If that fails
+        (or VIDEO_RENDERER is "moviepy"), the job falls back to MoviePy
+        compositing, where the background is opened and cropped/resized to
+        portrait only once and shared by every fallback job.
         
+        Args:
+            background_path: Path to background video shared by all jobs
+            jobs: List of dicts with generate_video keyword arguments
+                  (audio_path, text_arab, text_translation, surah_name,
+                  ayat_number and optional word_timings)
+            
+        Returns:
+            List of output file info dicts, in the same order as jobs
+        """
+        # Decoding, text rendering and encoding all block, so keep them off
+        # the event loop
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            _RENDER_EXECUTOR, self._generate_video_batch_sync, background_path, jobs
+        )
+
+    def _generate_video_batch_sync(
+        self,
+        background_path: str,
+        jobs: List[Dict[str, Any]]
+    ) -> List[Dict[str, Any]]:
+        """Blocking implementation of generate_video_batch (runs on a render worker)"""
         try:
-            # Load background video
-            video = VideoFileClip(background_path)
+            with ExitStack() as stack:
+                background = None
+                results = []
+                for job in jobs:
+                    result = None
+                    if VIDEO_RENDERER == 'ffmpeg':
+                        try:
+                            result = self._render_video_ffmpeg(background_path, **job)
+                        except Exception as e:
+                            print(f"FFmpeg compositing failed, falling back to MoviePy: {e}")
+                    
+                    if not result:
+                        if background is None:
+                            # Load background video (audio track is replaced by murotal)
+                            video = stack.enter_context(closing(self._open_background(background_path)))
+                            background = self._buffer_background(video)
+                        result = self._render_video(background, **job)
+                    
+                    results.append(result)
+                return results
             
-            # Load audio
-            audio = AudioFileClip(audio_path)
+        except Exception as e:
+            raise Exception(f"Video generation failed: {str(e)}")
+
+    def _probe_durations(self, audio_path: str) -> Tuple[float, float]:
+        """Return (audio_duration, video_duration) for a murotal audio file"""
+        # Probe audio duration (the track itself is muxed by ffmpeg)
+        with closing(AudioFileClip(audio_path)) as audio:
             audio_duration = audio.duration
+        
+        # Add small padding after audio ends (1 second silence)
+        audio_padding = 1.0
+        
+        # Video duration = audio duration + padding (no minimum to avoid crackling)
+        return audio_duration, audio_duration + audio_padding
+
+    def _create_text_clips(
+        self,
+        text_arab: str,
+        text_translation: str,
+        surah_name: str,
+        ayat_number: int,
+        word_timings: list,
+        audio_duration: float,
+        video_duration: float
+    ) -> list:
+        """
+        Create the timed Arabic, translation and reference text clips and the watermark.
+        
+        Clips are plain TextOverlay specs: the ffmpeg renderer feeds them to
+        its filter graph as PNG inputs and the MoviePy renderer blends them
+        with _make_overlay_blender, so no ImageClip is ever built for text.
+        
+        Returns:
+            List of TextOverlay specs
+        """
+        # Calculate synchronized text timing based on audio
+        text_timing = self._calculate_text_timing(audio_duration, text_arab, text_translation)
+        
+        # Store word timings for use in clip creation
+        self._current_word_timings = word_timings
+        
+        # Position content in center area (adjusted since no calendar)
+        content_start = int(self.height * 0.20)
+        content_end = self.height - 150
+        
+        # Arabic text position (centered in content area)
+        arab_y = content_start + 150
+        
+        # Try to use word timings from Quran.com API for accurate sync
+        arab_segment_clips = None
+        if word_timings and len(word_timings) > 0:
+            # Use word-level timestamps for accurate sync with qari
+            # Font size 56 for better readability
+            # Include translation to show below Arabic text
+            arab_segment_clips = self._create_word_timed_clips(
+                text_arab=text_arab,
+                word_timings=word_timings,
+                video_duration=video_duration,
+                base_y=arab_y,
+                fontsize=56,
+                text_translation=text_translation
+            )
+        
+        # Fallback to segment-based display with translation if no word timings
+        if not arab_segment_clips:
+            arab_segment_clips = self._create_segment_clips_with_translation(
+                text_arab=text_arab,
+                text_translation=text_translation,
+                audio_duration=audio_duration,
+                base_y=arab_y,
+                fontsize=56,
+                num_segments=None  # Auto-calculate based on audio length
+            )
+        
+        # Create surah reference (translation now appears per-line below Arabic text)
+        surah_ref = f"— QS. {surah_name}: {ayat_number}"
+        ref_img = self._create_aesthetic_text(surah_ref, fontsize=22, color='#D4C4A8')
+        
+        # Position reference at bottom area
+        ref_y = content_end - 60
+        
+        # Reference clip - visible throughout video
+        fade_duration = 0.5
+        ref_clip = TextOverlay(
+            ref_img, start=0, duration=video_duration, y=ref_y, fade=fade_duration
+        )
+        
+        clips = []
+        
+        # Add Arabic segment clips (segment by segment display)
+        if arab_segment_clips:
+            clips.extend(arab_segment_clips)
+        else:
+            # Fallback: create single Arabic clip if segmentation failed
+            arab_img = self._create_aesthetic_text(text_arab, fontsize=48, color='white', arabic=True)
+            arab_clip = TextOverlay(
+                arab_img, start=0, duration=video_duration, y=arab_y, fade=0.5
+            )
+            clips.append(arab_clip)
+        
+        # Add reference clip (translation now appears per-line with Arabic)
+        clips.append(ref_clip)
+        clips.append(self._create_watermark_overlay(video_duration))
+        return merge_concurrent_overlays([crop_transparent_margins(o) for o in clips], self.width)
+
+    def _render_video_ffmpeg(
+        self,
+        background_path: str,
+        audio_path: str,
+        text_arab: str,
+        text_translation: str,
+        surah_name: str,
+        ayat_number: int,
+        word_timings: list = None
+    ) -> Dict[str, Any]:
+        """
+        Render one ayat video with a single ffmpeg filter graph.
+        
+        Crop, scale, darkening, chrome and text overlays all run inside
+        ffmpeg, so no frame is converted to a NumPy array.
+        
+        Args:
+            background_path: Path to background video
+            audio_path: Path to murotal audio file
+            text_arab: Arabic text
+            text_translation: Translation text
+            surah_name: Surah name for reference
+            ayat_number: Ayat number for reference
+            word_timings: Optional word timings from Quran.com API
             
-            # Add small padding after audio ends (1 second silence)
-            audio_padding = 1.0
-            
-            # Video duration = audio duration + padding (no minimum to avoid crackling)
-            video_duration = audio_duration + audio_padding
-            
-            # Apply audio fade out to prevent crackling at the end
-            audio = audio.audio_fadeout(0.5)
-            
-            # Calculate synchronized text timing based on audio
-            text_timing = self._calculate_text_timing(audio_duration, text_arab, text_translation)
-            
-            # Store word timings for use in clip creation
-            self._current_word_timings = word_timings
-            
-            # Resize and crop video to 9:16
-            video = self._resize_to_portrait(video)
-            
-            # Loop or trim video to match duration
-            if video.duration < video_duration:
-                video = video.loop(duration=video_duration)
-            else:
-                video = video.subclip(0, video_duration)
-            
-            # Darken the background slightly for text readability
-            video = video.fl_image(self._darken_frame)
-            
-            # Create iPhone lock screen elements (calendar/date removed)
-            status_bar_img = self._create_status_bar()
-            bottom_bar_img = self._create_bottom_bar()
-            
-            # Position content in center area (adjusted since no calendar)
-            content_start = int(self.height * 0.20)
-            content_end = self.height - 150
-            
-            # Arabic text position (centered in content area)
-            arab_y = content_start + 150
-            
-            # Try to use word timings from Quran.com API for accurate sync
-            arab_segment_clips = None
-            if word_timings and len(word_timings) > 0:
-                # Use word-level timestamps for accurate sync with qari
-                # Font size 56 for better readability
-                # Include translation to show below Arabic text
-                arab_segment_clips = self._create_word_timed_clips(
-                    text_arab=text_arab,
-                    word_timings=word_timings,
-                    video_duration=video_duration,
-                    base_y=arab_y,
-                    fontsize=56,
-                    text_translation=text_translation
-                )
-            
-            # Fallback to segment-based display with translation if no word timings
-            if not arab_segment_clips:
-                arab_segment_clips = self._create_segment_clips_with_translation(
-                    text_arab=text_arab,
-                    text_translation=text_translation,
-                    audio_duration=audio_duration,
-                    base_y=arab_y,
-                    fontsize=56,
-                    num_segments=None  # Auto-calculate based on audio length
-                )
-            
-            # Create surah reference (translation now appears per-line below Arabic text)
-            surah_ref = f"— QS. {surah_name}: {ayat_number}"
-            ref_img = self._create_aesthetic_text(surah_ref, fontsize=22, color='#D4C4A8')
-            
-            # Position reference at bottom area
-            ref_y = content_end - 60
-            
-            # Reference clip - visible throughout video
-            fade_duration = 0.5
-            ref_clip = ImageClip(ref_img).set_duration(video_duration)
-            ref_clip = ref_clip.set_start(0)
-            ref_clip = ref_clip.set_position(('center', ref_y))
-            ref_clip = ref_clip.crossfadein(fade_duration)
-            ref_clip = ref_clip.crossfadeout(fade_duration)
-            
-            # Create status bar clip (top right)
-            status_bar_clip = ImageClip(status_bar_img).set_duration(video_duration)
-            status_bar_clip = status_bar_clip.set_position(('center', 10))
-            status_bar_clip = status_bar_clip.crossfadein(self.fade_duration)
-            
-            # Create bottom bar clip
-            bottom_bar_clip = ImageClip(bottom_bar_img).set_duration(video_duration)
-            bottom_bar_clip = bottom_bar_clip.set_position(('center', self.height - 100))
-            bottom_bar_clip = bottom_bar_clip.crossfadein(self.fade_duration)
-            
-            # Create list of clips (calendar/date removed)
-            clips = [video, status_bar_clip]
-            
-            # Add Arabic segment clips (segment by segment display)
-            if arab_segment_clips:
-                clips.extend(arab_segment_clips)
-            else:
-                # Fallback: create single Arabic clip if segmentation failed
-                arab_img = self._create_aesthetic_text(text_arab, fontsize=48, color='white', arabic=True)
-                arab_clip = ImageClip(arab_img).set_duration(video_duration)
-                arab_clip = arab_clip.set_position(('center', arab_y))
-                arab_clip = arab_clip.crossfadein(0.5)
-                arab_clip = arab_clip.crossfadeout(0.5)
-                clips.append(arab_clip)
-            
-            # Add reference and bottom bar clips (translation now appears per-line with Arabic)
-            clips.extend([ref_clip, bottom_bar_clip])
-            
-            # Add watermark
-            watermark_clip = self._create_watermark_clip(video_duration)
-            clips.append(watermark_clip)
-            
-            # Composite all clips
-            final = CompositeVideoClip(clips)
-            
-            # Set audio (no fade to avoid crackling at the end)
-            final = final.set_audio(audio)
-            
-            # Only fade in video, not fade out (to avoid audio crackling)
-            final = final.crossfadein(self.fade_duration)
-            
-            # Write output with better audio settings
-            final.write_videofile(
-                str(output_path),
+        Returns:
+            Dict with output file info
+        """
+        output_filename = f"quran_{surah_name}_{ayat_number}_{uuid.uuid4().hex[:8]}.mp4"
+        output_path = self.output_dir / output_filename
+        
+        audio_duration, video_duration = self._probe_durations(audio_path)
+        clips = self._create_text_clips(
+            text_arab, text_translation, surah_name, ayat_number,
+            word_timings, audio_duration, video_duration
+        )
+        codec, preset, codec_params = self._encoder_settings()
+        
+        try:
+            composite_video(
+                background_path=background_path,
+                audio_path=audio_path,
+                output_path=output_path,
+                duration=video_duration,
+                audio_duration=audio_duration,
+                width=self.width,
+                height=self.height,
                 fps=self.fps,
-                codec='libx264',
-                audio_codec='aac',
-                audio_bitrate='192k',
-                threads=4,
-                preset='medium',
-                logger=None
+                darken=self.bg_darken,
+                chrome=self._create_chrome_overlay(),
+                chrome_fade=self.fade_duration,
+                overlays=clips,
+                codec=codec,
+                preset=preset,
+                codec_params=codec_params,
+                # Decode on the GPU too when it is already encoding there
+                hwaccel=_HW_DECODERS.get(codec)
             )
-            
-            # Get file info
-            file_size = os.path.getsize(output_path)
-            
-            # Cleanup
-            video.close()
-            audio.close()
-            final.close()
-            
-            return {
-                "output_file": str(output_path),
-                "filename": output_filename,
-                "duration": video_duration,
-                "file_size": file_size
-            }
-            
-        except Exception as e:
-            raise Exception(f"Video generation failed: {str(e)}")
+        except Exception:
+            if output_path.exists():
+                output_path.unlink()
+            raise
+        
+        return {
+            "output_file": str(output_path),
+            "filename": output_filename,
+            "duration": video_duration,
+            "file_size": os.path.getsize(output_path)
+        }
 
-    def _create_logo_clip(self, duration: float, y_position: int) -> Optional[ImageClip]:
-        """Create logo clip with white color and transparent background"""
-        if not self.logo_path.exists():
-            print(f"Logo not found at {self.logo_path}")
-            return None
+    def _render_video(
+        self,
+        background: VideoFileClip,
+        audio_path: str,
+        text_arab: str,
+        text_translation: str,
+        surah_name: str,
+        ayat_number: int,
+        word_timings: list = None
+    ) -> Dict[str, Any]:
+        """
+        Render one ayat video with MoviePy on an already portrait-sized background.
         
-        try:
-            # Load logo
-            logo = Image.open(self.logo_path).convert('RGBA')
-            
-            # Resize logo to fit (max width 150px, maintain aspect ratio)
-            max_logo_width = 150
-            if logo.width > max_logo_width:
-                ratio = max_logo_width / logo.width
-                new_size = (max_logo_width, int(logo.height * ratio))
-                logo = logo.resize(new_size, Image.LANCZOS)
-            
-            # Get pixel data
-            logo_data = np.array(logo)
-            
-            # Create mask based on non-white/non-transparent pixels
-            # If logo has alpha channel, use it
-            if logo_data.shape[2] == 4:
-                alpha = logo_data[:, :, 3]
-            else:
-                # Create alpha from non-white pixels
-                r, g, b = logo_data[:, :, 0], logo_data[:, :, 1], logo_data[:, :, 2]
-                # Pixels that are not pure white (255,255,255) become visible
-                alpha = 255 - np.minimum(np.minimum(r, g), b)
-            
-            # Create white logo with proper alpha
-            white_logo = np.zeros((logo_data.shape[0], logo_data.shape[1], 4), dtype=np.uint8)
-            white_logo[:, :, 0] = 255  # R
-            white_logo[:, :, 1] = 255  # G
-            white_logo[:, :, 2] = 255  # B
-            white_logo[:, :, 3] = alpha  # A
-            
-            # Create ImageClip with mask
-            logo_clip = ImageClip(white_logo).set_duration(duration)
-            logo_clip = logo_clip.set_position(('center', y_position))
-            
-            return logo_clip
+        Args:
+            background: Background clip already resized to 9:16
+            audio_path: Path to murotal audio file
+            text_arab: Arabic text
+            text_translation: Translation text
+            surah_name: Surah name for reference
+            ayat_number: Ayat number for reference
+            word_timings: Optional word timings from Quran.com API
             
-        except Exception as e:
-            print(f"Error loading logo: {e}")
-            return None
-    
-    def _create_watermark_clip(self, duration: float) -> ImageClip:
-        """Create minimalist text watermark (small, low opacity, bottom center)"""
+        Returns:
+            Dict with output file info
+        """
+        output_filename = f"quran_{surah_name}_{ayat_number}_{uuid.uuid4().hex[:8]}.mp4"
+        output_path = self.output_dir / output_filename
+        video = background
+        
+        audio_duration, video_duration = self._probe_durations(audio_path)
+        
+        # Loop or trim video to match duration
+        if video.duration < video_duration:
+            video = loop(video, duration=video_duration)
+        else:
+            video = video.subclip(0, video_duration)
+        
+        # Darken the background and blend static iPhone lock screen chrome as
+        # one pre-composited layer in the same pass (calendar/date removed)
+        video = video.fl(self._make_chrome_blender(self._create_chrome_overlay(), self.fade_duration))
+        
+        # Blend text on top of the chrome (background source is closed by the caller)
+        text_clips = self._create_text_clips(
+            text_arab, text_translation, surah_name, ayat_number,
+            word_timings, audio_duration, video_duration
+        )
+        video = video.fl(self._make_overlay_blender(text_clips))
+        
+        # Only fade in video, not fade out (to avoid audio crackling)
+        self._write_output(crossfadein(video, self.fade_duration), output_path, audio_path, audio_duration)
+        
+        # Get file info
+        file_size = os.path.getsize(output_path)
+        
+        return {
+            "output_file": str(output_path),
+            "filename": output_filename,
+            "duration": video_duration,
+            "file_size": file_size
+        }
+
+    def _encoder_settings(self) -> Tuple[str, str, Optional[List[str]]]:
+        """Pick (codec, preset, extra ffmpeg params) for the video stream"""
+        codec = _hardware_encoder() if VIDEO_CODEC == 'auto' else VIDEO_CODEC
+        if codec in _HW_ENCODERS:
+            # Hardware encoders have their own presets and ignore -threads
+            preset, params = _HW_ENCODERS[codec]
+            return codec, preset, list(params)
+        return 'libx264', VIDEO_PRESET, None
+
+    def _open_background(self, background_path: str) -> PortraitVideoClip:
+        """
+        Open a background already cropped and scaled to portrait by ffmpeg.
+        
+        Decodes on the GPU when the encoder runs there, and falls back to
+        software decoding if the hardware decoder cannot open the file.
+        """
+        hwaccel = _HW_DECODERS.get(self._encoder_settings()[0])
+        if hwaccel:
+            try:
+                return PortraitVideoClip(background_path, self.width, self.height, hwaccel)
+            except Exception as e:
+                print(f"Hardware decoding failed, using software decoder: {e}")
+        return PortraitVideoClip(background_path, self.width, self.height)
+
+    def _write_output(
+        self,
+        final: VideoClip,
+        output_path: Path,
+        audio_path: str,
+        audio_duration: float
+    ) -> None:
+        """
+        Encode final composite to MP4 and mux the murotal audio into it.
+        
+        Frames are piped to a single ffmpeg process that also encodes the
+        audio straight from the source file, so the audio is never decoded
+        and re-chunked in Python and no intermediate video file is written.
+        
+        Args:
+            final: Composited video clip (without audio)
+            output_path: Destination MP4 path
+            audio_path: Path to murotal audio file
+            audio_duration: Audio duration in seconds (for the fade out)
+        """
+        codec, preset, codec_params = self._encoder_settings()
+        encode_frames(
+            final.iter_frames(fps=self.fps, dtype='uint8'),
+            output_path,
+            width=self.width,
+            height=self.height,
+            fps=self.fps,
+            duration=final.duration,
+            audio_path=audio_path,
+            audio_duration=audio_duration,
+            codec=codec,
+            preset=preset,
+            codec_params=codec_params
+        )
+
+    def _create_watermark_image(self) -> np.ndarray:
+        """Create minimalist text watermark image (small, low opacity)"""
         font = self._get_font(20)  # Small font size
         
         # Calculate text size
-        dummy_img = Image.new('RGBA', (1, 1))
-        draw = ImageDraw.Draw(dummy_img)
-        bbox = draw.textbbox((0, 0), self.watermark_text, font=font)
+        bbox = _MEASURE_DRAW.textbbox((0, 0), self.watermark_text, font=font)
         text_width = bbox[2] - bbox[0] + 20
         text_height = bbox[3] - bbox[1] + 10
         
@@ -1196,42 +1306,143 @@ class VideoGenerator:
         # Draw watermark text (white with low opacity)
         draw.text((10, 5), self.watermark_text, font=font, fill=(255, 255, 255, alpha))
         
-        # Convert to numpy array
-        watermark_array = np.array(img)
+        return np.asarray(img)
+    
+    def _create_watermark_overlay(self, video_duration: float) -> TextOverlay:
+        """Watermark shown for the whole video, on top of everything and without fade"""
+        return TextOverlay(
+            self._create_watermark_image(), start=0, duration=video_duration,
+            y=self.height - 80, fade=0  # 80px from bottom
+        )
+    
+    def _create_chrome_overlay(self) -> np.ndarray:
+        """
+        Pre-composite static lock screen chrome into one full-frame RGBA layer.
+        
+        Status bar and bottom bar never change during a video, so blending
+        them once here replaces two per-frame composites with one. They do
+        not change between videos or jobs either, so the layer is built on
+        first use and shared read-only by every later render. The watermark
+        is not part of it: it is shown unfaded from the first frame, see
+        _create_watermark_overlay.
+        """
+        cache_key = (self.width, self.height)
+        with _CHROME_OVERLAYS_LOCK:
+            overlay = _CHROME_OVERLAYS.get(cache_key)
+        if overlay is not None:
+            return overlay
+        
+        chrome = Image.new('RGBA', (self.width, self.height), (0, 0, 0, 0))
+        layers = [
+            (self._create_status_bar(), 10),
+            (self._create_bottom_bar(), self.height - 100),
+        ]
+        for layer, y in layers:
+            layer_img = Image.fromarray(layer)
+            chrome.alpha_composite(layer_img, dest=((self.width - layer_img.width) // 2, y))
+        overlay = np.asarray(chrome)
+        overlay.flags.writeable = False
+        with _CHROME_OVERLAYS_LOCK:
+            _CHROME_OVERLAYS[cache_key] = overlay
+        return overlay
+    
+    def _make_chrome_blender(self, overlay: np.ndarray, fade_in: float):
+        """
+        Build a MoviePy fl() filter that darkens each frame and blends a static overlay.
+        
+        Darkening (lookup table) and the overlay blend run as one integer
+        pass per frame; rows without visible overlay pixels are only darkened.
         
-        # Create ImageClip positioned at bottom center
-        watermark_clip = ImageClip(watermark_array).set_duration(duration)
-        watermark_y = self.height - 80  # 80px from bottom
-        watermark_clip = watermark_clip.set_position(('center', watermark_y))
+        Args:
+            overlay: Full-frame RGBA overlay
+            fade_in: Overlay fade-in duration in seconds (0 for no fade)
+            
+        Returns:
+            Filter function taking (get_frame, t)
+        """
+        rgb = np.ascontiguousarray(overlay[:, :, :3])
+        alpha = np.ascontiguousarray(overlay[:, :, 3])
+        rows = alpha.any(axis=1)
+        
+        def blend(get_frame, t):
+            opacity = min(1.0, t / fade_in) if fade_in > 0 else 1.0
+            frame = get_frame(t)
+            # Reduce brightness to configured level (default 55%) for text readability
+            return darken_and_blend(
+                frame, self._darken_lut, rgb, alpha, rows, int(opacity * 255), np.empty_like(frame)
+            )
         
-        return watermark_clip
+        return blend
     
-    def _darken_frame(self, frame: np.ndarray) -> np.ndarray:
-        """Darken video frame slightly for text readability while keeping aesthetic"""
-        # Reduce brightness to configured level (default 55%)
-        darkened = (frame * self.bg_darken).astype(np.uint8)
-        return darkened
+    def _make_overlay_blender(self, overlays: List[TextOverlay]):
+        """
+        Build a MoviePy fl() filter that blends timed text overlays onto each frame.
+        
+        Replaces CompositeVideoClip for the text layers: only overlays visible
+        at t are blended, in place and with integer math, instead of MoviePy
+        blitting every clip through float masks onto a full-frame copy.
+        
+        Args:
+            overlays: Text overlays, blended in order
+            
+        Returns:
+            Filter function taking (get_frame, t)
+        """
+        sprites = []
+        for overlay in overlays:
+            h, w = overlay.image.shape[:2]
+            x0, y0 = (self.width - w) // 2, overlay.y
+            # Clip the sprite to the frame
+            top, left = max(0, -y0), max(0, -x0)
+            bottom, right = min(h, self.height - y0), min(w, self.width - x0)
+            if top >= bottom or left >= right:
+                continue
+            image = overlay.image[top:bottom, left:right]
+            sprites.append((
+                overlay, y0 + top, y0 + bottom, x0 + left, x0 + right,
+                np.ascontiguousarray(image[:, :, :3]), np.ascontiguousarray(image[:, :, 3])
+            ))
+        
+        def blend(get_frame, t):
+            frame = get_frame(t)
+            if not frame.flags.writeable:
+                frame = frame.copy()
+            for overlay, y0, y1, x0, x1, rgb, alpha in sprites:
+                end = overlay.start + overlay.duration
+                if not overlay.start <= t < end:
+                    continue
+                # Linear fade in/out, as crossfadein/crossfadeout on the clip
+                # mask, applied as one scalar inside the blend kernel
+                opacity = 1.0
+                if overlay.fade > 0:
+                    opacity = min(1.0, (t - overlay.start) / overlay.fade, (end - t) / overlay.fade)
+                region = frame[y0:y1, x0:x1]
+                blend_rgba_over_rgb(region, rgb, alpha, region, int(opacity * 255))
+            return frame
+        
+        return blend
     
-    def _resize_to_portrait(self, video: VideoFileClip) -> VideoFileClip:
-        """Resize video to 9:16 portrait format"""
-        target_ratio = self.width / self.height  # 9:16 = 0.5625
-        current_ratio = video.w / video.h
-        
-        if current_ratio > target_ratio:
-            # Video is wider, crop sides
-            new_width = int(video.h * target_ratio)
-            x_center = video.w / 2
-            video = video.crop(
-                x1=x_center - new_width/2,
-                x2=x_center + new_width/2
-            )
-        else:
-            # Video is taller, crop top/bottom
-            new_height = int(video.w / target_ratio)
-            y_center = video.h / 2
-            video = video.crop(
-                y1=y_center - new_height/2,
-                y2=y_center + new_height/2
-            )
+    def _buffer_background(self, video: VideoClip) -> VideoClip:
+        """
+        Decode a short background once into memory at the output frame rate.
+        
+        Looping a file clip rewinds its ffmpeg reader (a new decoder process
+        per loop) and re-runs the per-frame crop/resize every pass. Buffered
+        frames are read-only; the chrome blender writes into a new frame.
+        Backgrounds over the memory budget are returned as is.
+        """
+        times = np.arange(0, video.duration, 1.0 / self.fps)
+        width, height = video.size
+        if times.size == 0 or times.size * width * height * 3 > _BACKGROUND_BUFFER_BYTES:
+            return video
+        
+        frames = np.empty((times.size, height, width, 3), dtype=np.uint8)
+        for i, t in enumerate(times):
+            frames[i] = video.get_frame(t)
+        frames.flags.writeable = False
+        last = times.size - 1
+        
+        def make_frame(t):
+            return frames[min(int(t * self.fps + 1e-6), last)]
         
-        return video.resize((self.width, self.height))
+        return VideoClip(make_frame, duration=video.duration)
@@ -391,6 +391,16 @@ class TestTextAnimator:
         )
         
         assert opacity == 1.0, "Opacity should be 1.0 during fully visible period"
+    
+    @given(duration=fade_duration_strategy)
+    @settings(max_examples=50)
+    def test_optional_fade_keeps_zero(self, duration: float):
+        """Zero fade should stay disabled while other values are clamped."""
+        animator = TextAnimator()
+        
+        assert animator.validate_optional_fade_duration(0.0) == 0.0
+        assert animator.validate_optional_fade_duration(duration) == \
+            animator.validate_fade_duration(duration)
 
 
 # Run tests if executed directly
@@ -21,7 +21,9 @@ class TestCaptionGeneration:
         ayat_number=st.integers(min_value=1, max_value=286),
         translation=st.text(min_size=1, max_size=300)
     )
-    @settings(max_examples=30)
+    # generate_template_caption tries the AI API first, so one example can
+    # take as long as a network timeout
+    @settings(max_examples=30, deadline=None)
     def test_template_caption_contains_required_elements(self, surah_name, ayat_number, translation):
         """Template caption should contain surah name, ayat number, and translation"""
         generator = CaptionGenerator()
@@ -8,10 +8,25 @@ Property tests for video generator
 import pytest
 import tempfile
 import os
+import subprocess
+import threading
+import time
 from pathlib import Path
+import numpy as np
 from hypothesis import given, strategies as st, settings
+from PIL import Image, ImageDraw
 from generator.background_manager import BackgroundManager
+from generator import video_generator
 from generator.video_generator import VideoGenerator
+from generator.frame_blend import blend_rgba_over_rgb, darken_and_blend
+from generator.ffmpeg_compositor import (
+    TextOverlay, build_filter_graph, chrome_bands, crop_transparent_margins, merge_concurrent_overlays
+)
+
+
+# Tests that run the Numba blend kernels: the first call may JIT-compile,
+# which would blow hypothesis' per-example deadline
+JIT_SETTINGS = settings(deadline=None)
 
 
 class TestBackgroundManager:
@@ -78,6 +93,125 @@ class TestVideoGenerator:
         assert generator.height == 1920
         assert generator.width / generator.height == 9 / 16
     
+    def test_fonts_are_shared_across_instances(self):
+        """Same font size should reuse one FreeType font across generators"""
+        font_a = VideoGenerator()._get_font(24)
+        font_b = VideoGenerator()._get_font(24)
+        assert font_a is font_b
+
+    def test_fonts_are_not_shared_across_threads(self):
+        """Each render thread should measure and draw with its own FreeType font"""
+        font = VideoGenerator()._get_font(24)
+        other = []
+        thread = threading.Thread(target=lambda: other.append(VideoGenerator()._get_font(24)))
+        thread.start()
+        thread.join()
+        assert other[0] is not font
+        assert other[0].path == font.path and other[0].size == font.size
+
+    def test_text_images_are_cached(self):
+        """Identical text renders should be drawn once and shared read-only"""
+        generator = VideoGenerator()
+        first = generator._create_aesthetic_text("Al-Fatihah", fontsize=22)
+        assert generator._create_aesthetic_text("Al-Fatihah", fontsize=22) is first
+        assert VideoGenerator()._create_aesthetic_text("Al-Fatihah", fontsize=22) is first
+        assert generator._create_aesthetic_text("Al-Fatihah", fontsize=24) is not first
+        assert not first.flags.writeable
+
+    def test_chrome_overlay_is_built_once(self):
+        """Static lock screen chrome should be drawn once and shared by every generator"""
+        generator = VideoGenerator()
+        chrome = generator._create_chrome_overlay()
+        assert generator._create_chrome_overlay() is chrome
+        assert VideoGenerator()._create_chrome_overlay() is chrome
+        assert chrome.shape == (generator.height, generator.width, 4)
+        assert not chrome.flags.writeable
+
+    def test_watermark_is_shown_unfaded_from_first_frame(self):
+        """Chrome and text fade in, but the watermark is fully visible at t=0"""
+        generator = VideoGenerator()
+        background = np.full((generator.height, generator.width, 3), 200, dtype=np.uint8)
+        clips = generator._create_text_clips(
+            "بِسْمِ اللَّهِ الرَّحْمَٰنِ الرَّحِيمِ", "Dengan nama Allah", "Al-Fatihah", 1, None, 3.0, 4.0
+        )
+        chrome = generator._make_chrome_blender(generator._create_chrome_overlay(), generator.fade_duration)
+        frame = generator._make_overlay_blender(clips)(lambda t: chrome(lambda _: background.copy(), t), 0)
+
+        # Darkened background with only the watermark blended at full opacity
+        expected = generator._make_chrome_blender(
+            np.zeros((generator.height, generator.width, 4), dtype=np.uint8), 0
+        )(lambda _: background.copy(), 0)
+        watermark = generator._create_watermark_image()
+        h, w = watermark.shape[:2]
+        x0, y0 = (generator.width - w) // 2, generator.height - 80
+        region = expected[y0:y0 + h, x0:x0 + w]
+        blend_rgba_over_rgb(
+            region, np.ascontiguousarray(watermark[:, :, :3]), np.ascontiguousarray(watermark[:, :, 3]),
+            region, 255
+        )
+        assert (frame == expected).all()
+
+    def test_hardware_encoder_is_probed_once_across_threads(self, monkeypatch):
+        """Concurrent workers should share one encoder probe and its answer"""
+        calls = []
+
+        def fake_run(args, **kwargs):
+            calls.append(args)
+            time.sleep(0.05)  # keep the probe in flight while other threads arrive
+            return subprocess.CompletedProcess(args, 0, stdout=b" V..... h264_nvenc ")
+
+        monkeypatch.setattr(video_generator.subprocess, "run", fake_run)
+        monkeypatch.setattr(video_generator, "_HW_ENCODER", None)
+        monkeypatch.setattr(video_generator, "_HW_ENCODER_PROBED", False)
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(video_generator._hardware_encoder()))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        # -encoders listing plus one test encode, run by the first thread only
+        assert results == ['h264_nvenc'] * 4
+        assert len(calls) == 2
+
+    @given(text=st.text(alphabet="abcdefghij klmnop", min_size=1, max_size=40))
+    @settings(max_examples=20)
+    def test_text_layers_match_direct_drawing(self, text):
+        """One rasterization painted as layers should equal drawing each layer"""
+        generator = VideoGenerator()
+        font = generator._get_font(28)
+        layers = [((3, 3), (0, 0, 0, 60)), ((2, 2), (0, 0, 0, 60)), ((0, 0), 'white')]
+        
+        expected = Image.new('RGBA', (400, 80), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(expected)
+        for (dx, dy), color in layers:
+            draw.multiline_text((30 + dx, 25 + dy), text, font=font, fill=color, align='center')
+        
+        layered = generator._render_text_layers((400, 80), text, font, (30, 25), layers)
+        assert (np.array(layered) == np.array(expected)).all()
+
+    @given(t=st.floats(min_value=0.0, max_value=3.0), color=st.integers(min_value=0, max_value=255))
+    @settings(JIT_SETTINGS, max_examples=30)
+    def test_overlay_blender_shows_text_only_while_visible(self, t, color):
+        """Opaque overlay pixels replace the frame only inside the overlay's time window"""
+        generator = VideoGenerator()
+        image = np.full((10, 20, 4), color, dtype=np.uint8)
+        image[:, :, 3] = 255
+        blend = generator._make_overlay_blender([TextOverlay(image, start=1.0, duration=1.0, y=50)])
+        background = np.full((generator.height, generator.width, 3), 7, dtype=np.uint8)
+        
+        frame = blend(lambda _: background.copy(), t)
+        x0 = (generator.width - 20) // 2
+        region = frame[50:60, x0:x0 + 20]
+        expected = color if 1.0 <= t < 2.0 else 7
+        assert (region == expected).all()
+        frame[50:60, x0:x0 + 20] = 7
+        assert (frame == 7).all()
+
     @given(text=st.text(min_size=1, max_size=200))
     @settings(max_examples=20)
     def test_text_wrapping(self, text):
@@ -90,6 +224,151 @@ class TestVideoGenerator:
             assert len(line) <= 50  # Allow some overflow for long words
 
 
+class TestFrameBlend:
+    """Overlay blending should respect alpha extremes"""
+    
+    @given(
+        pixel=st.integers(min_value=0, max_value=255),
+        overlay=st.integers(min_value=0, max_value=255)
+    )
+    @settings(JIT_SETTINGS, max_examples=30)
+    def test_blend_alpha_extremes(self, pixel, overlay):
+        """Alpha 0 keeps the frame, alpha 255 shows the overlay"""
+        frame = np.full((2, 3, 3), pixel, dtype=np.uint8)
+        rgb = np.full((2, 3, 3), overlay, dtype=np.uint8)
+        
+        transparent = blend_rgba_over_rgb(frame, rgb, np.zeros((2, 3), np.uint8), np.empty_like(frame))
+        opaque = blend_rgba_over_rgb(frame, rgb, np.full((2, 3), 255, np.uint8), np.empty_like(frame))
+        
+        assert (transparent == pixel).all()
+        assert (opaque == overlay).all()
+    
+    @given(
+        alpha=st.integers(min_value=0, max_value=255),
+        opacity=st.integers(min_value=0, max_value=255)
+    )
+    @settings(JIT_SETTINGS, max_examples=30)
+    def test_blend_opacity_scales_alpha(self, alpha, opacity):
+        """Blending at an opacity should match blending with the alpha pre-scaled"""
+        rng = np.random.default_rng(alpha * 256 + opacity)
+        frame = rng.integers(0, 256, (4, 5, 3), dtype=np.uint8)
+        rgb = rng.integers(0, 256, (4, 5, 3), dtype=np.uint8)
+        
+        faded = blend_rgba_over_rgb(frame, rgb, np.full((4, 5), alpha, np.uint8), np.empty_like(frame), opacity)
+        scaled = np.full((4, 5), alpha * opacity // 255, np.uint8)
+        assert np.array_equal(faded, blend_rgba_over_rgb(frame, rgb, scaled, np.empty_like(frame)))
+    
+    @given(level=st.floats(min_value=0.0, max_value=1.0))
+    @settings(JIT_SETTINGS, max_examples=20)
+    def test_lut_matches_float_darken(self, level):
+        """LUT darkening should equal the float multiply-and-truncate it replaces"""
+        frame = np.arange(768, dtype=np.uint16).astype(np.uint8).reshape(16, 16, 3)
+        lut = (np.arange(256) * level).astype(np.uint8)
+        # No visible overlay rows: the fused kernel only darkens
+        empty_rgb = np.zeros_like(frame)
+        empty_alpha = np.zeros(frame.shape[:2], np.uint8)
+        darkened = darken_and_blend(
+            frame, lut, empty_rgb, empty_alpha, empty_alpha.any(axis=1), 255, np.empty_like(frame)
+        )
+        assert (darkened == (frame * level).astype(np.uint8)).all()
+    
+    @given(
+        level=st.floats(min_value=0.0, max_value=1.0),
+        opacity=st.integers(min_value=0, max_value=255)
+    )
+    @settings(JIT_SETTINGS, max_examples=20)
+    def test_darken_and_blend_matches_separate_passes(self, level, opacity):
+        """Fused darken+blend should equal the LUT followed by the overlay blend"""
+        rng = np.random.default_rng(0)
+        frame = rng.integers(0, 256, (8, 6, 3), dtype=np.uint8)
+        rgb = rng.integers(0, 256, (8, 6, 3), dtype=np.uint8)
+        alpha = rng.integers(0, 256, (8, 6), dtype=np.uint8)
+        alpha[::2] = 0
+        lut = (np.arange(256) * level).astype(np.uint8)
+        
+        fused = darken_and_blend(frame, lut, rgb, alpha, alpha.any(axis=1), opacity, np.empty_like(frame))
+        scaled = (alpha.astype(np.uint16) * opacity // 255).astype(np.uint8)
+        expected = blend_rgba_over_rgb(lut[frame], rgb, scaled, np.empty_like(frame))
+        assert (fused == expected).all()
+
+
+class TestFFmpegCompositor:
+    """Filter graph should chain one overlay per chrome band and text clip"""
+    
+    @given(count=st.integers(min_value=0, max_value=12), bands=st.integers(min_value=0, max_value=3))
+    @settings(max_examples=20)
+    def test_filter_graph_chains_every_overlay(self, count, bands):
+        """Each chrome band and overlay input is composited once and the chain ends at [vout]"""
+        overlays = [
+            TextOverlay(np.zeros((4, 4, 4), np.uint8), start=i * 0.5, duration=1.0, y=100, fade=0.15)
+            for i in range(count)
+        ]
+        graph = build_filter_graph(1080, 1920, 30, 0.55, 4.0, 0.8, [i * 600 for i in range(bands)], overlays)
+        
+        assert graph.count("overlay=") == count + bands
+        assert graph.count("loop=loop=-1:size=1") == count + bands  # every PNG decoded once
+        for i in range(count):
+            assert f"[{2 + bands + i}:v]" in graph
+        assert graph.endswith(f"[v{count}]format=yuv420p[vout]")
+    
+    @given(rows=st.lists(st.integers(min_value=0, max_value=99), max_size=30))
+    @settings(max_examples=30)
+    def test_chrome_bands_cover_every_visible_row(self, rows):
+        """Pasting the bands back onto a transparent frame should rebuild the chrome"""
+        chrome = np.zeros((100, 8, 4), dtype=np.uint8)
+        chrome[rows] = 255
+        rebuilt = np.zeros_like(chrome)
+        for y, band in chrome_bands(chrome):
+            assert band[:, :, 3].any(axis=1).all()
+            rebuilt[y:y + band.shape[0]] = band
+        assert (rebuilt == chrome).all()
+    
+    @given(
+        width_a=st.integers(min_value=100, max_value=300),
+        delta=st.integers(min_value=-20, max_value=20),
+        gap=st.integers(min_value=0, max_value=10)
+    )
+    @settings(JIT_SETTINGS, max_examples=30)
+    def test_merged_overlays_render_like_separate_ones(self, width_a, delta, gap):
+        """Merging same-timed neighbouring overlays should not move any pixel"""
+        generator = VideoGenerator()
+        width_b = width_a + delta
+        rng = np.random.default_rng(width_a * 1000 + width_b)
+        overlays = [
+            TextOverlay(rng.integers(0, 256, (30, width_a, 4), dtype=np.uint8), start=0, duration=1, y=100),
+            TextOverlay(rng.integers(0, 256, (20, width_b, 4), dtype=np.uint8), start=0, duration=1, y=130 + gap),
+        ]
+        merged = merge_concurrent_overlays(overlays, generator.width)
+        assert len(merged) == 1
+        
+        background = np.zeros((generator.height, generator.width, 3), dtype=np.uint8)
+        separate = generator._make_overlay_blender(overlays)(lambda _: background.copy(), 0.5)
+        combined = generator._make_overlay_blender(merged)(lambda _: background.copy(), 0.5)
+        assert np.abs(separate.astype(int) - combined.astype(int)).max() <= 1
+    
+    @given(
+        pad=st.tuples(*[st.integers(min_value=0, max_value=15)] * 4),
+        width=st.integers(min_value=1, max_value=200)
+    )
+    @settings(JIT_SETTINGS, max_examples=30)
+    def test_cropped_overlay_renders_like_padded_one(self, pad, width):
+        """Trimming transparent margins should shrink the sprite without moving any pixel"""
+        generator = VideoGenerator()
+        top, bottom, left, right = pad
+        rng = np.random.default_rng(width)
+        image = np.zeros((20 + top + bottom, width + left + right, 4), dtype=np.uint8)
+        image[top:top + 20, left:left + width] = rng.integers(1, 256, (20, width, 4), dtype=np.uint8)
+        overlay = TextOverlay(image, start=0, duration=1, y=100)
+        cropped = crop_transparent_margins(overlay)
+        assert cropped.image.shape[0] == 20
+        assert cropped.image.shape[1] <= image.shape[1]
+        
+        background = np.zeros((generator.height, generator.width, 3), dtype=np.uint8)
+        padded = generator._make_overlay_blender([overlay])(lambda _: background.copy(), 0.5)
+        trimmed = generator._make_overlay_blender([cropped])(lambda _: background.copy(), 0.5)
+        assert np.array_equal(padded, trimmed)
+
+
 class TestTranslationInclusion:
     """
     Property 7: Translation Inclusion
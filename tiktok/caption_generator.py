@@ -1,12 +1,19 @@
 from typing import Dict, Any, Optional
 import random
 import urllib.parse
+import threading
 import httpx
 
 
 class CaptionGenerator:
     DEFAULT_HASHTAGS = "#quran #murotal #islamic #muslim #ayatquran #dakwah #islam #fyp #quranquotes #reminder"
     
+    # Shared by every instance (one is created per request) so the connection
+    # to the AI API is kept alive instead of paying a new TLS handshake each time.
+    # Created on first use, so a closed client is replaced on the next request
+    _http: Optional[httpx.Client] = None
+    _http_lock = threading.Lock()
+    
     def __init__(self):
         self.ai_api_url = "https://api.elrayyxml.web.id/api/ai/chatgpt"
         
@@ -22,6 +29,22 @@ class CaptionGenerator:
             "Follow untuk ayat lainnya.",
         ]
     
+    @classmethod
+    def _client(cls) -> httpx.Client:
+        """Return the shared HTTP client, creating it on first use"""
+        with cls._http_lock:
+            if cls._http is None:
+                cls._http = httpx.Client(timeout=15.0, limits=httpx.Limits(max_keepalive_connections=4))
+            return cls._http
+    
+    @classmethod
+    def close(cls) -> None:
+        """Close the shared HTTP client (called on app shutdown)"""
+        with cls._http_lock:
+            if cls._http is not None:
+                cls._http.close()
+                cls._http = None
+    
     def _generate_with_ai(self, surah_name: str, ayat_number: int, translation: str) -> Optional[str]:
         """Generate caption using AI API"""
         
@@ -59,7 +82,7 @@ Tulis caption-nya:"""
             encoded_prompt = urllib.parse.quote(prompt)
             url = f"{self.ai_api_url}?text={encoded_prompt}"
             
-            response = httpx.get(url, timeout=15.0)
+            response = self._client().get(url)
             
             if response.status_code == 200:
                 data = response.json()